@@ -0,0 +1,105 @@
+import json
+import os
+import sqlite3
+import threading
+
+# -------------------------
+# 오프라인 배경지도 (MBTiles)
+# -------------------------
+# MBTiles 파일(SQLite)에 든 래스터/벡터 타일을 로컬 타일 서버로 내보내고,
+# 밝음/어두움 모드에 맞는 Mapbox GL 스타일 JSON을 만들어 줍니다.
+# Mapbox 토큰이나 외부 타일 요청 없이 지도를 그릴 수 있습니다.
+
+BASEMAP_PATHS = {
+    "light": os.environ.get("CARCRASH_BASEMAP_LIGHT", "data/basemap/light.mbtiles"),
+    "dark": os.environ.get("CARCRASH_BASEMAP_DARK", "data/basemap/dark.mbtiles"),
+}
+THEME_STYLES = {"밝음 모드": "light", "어두움 모드": "dark"}
+
+# 벡터 타일(OpenMapTiles 스키마)용 간단한 색 구성
+VECTOR_COLORS = {
+    "light": {"background": "#f8f9fa", "water": "#cfe3f2", "landcover": "#e8f0e0", "landuse": "#eeeeee",
+              "road": "#ffffff", "road_casing": "#d6d6d6", "boundary": "#b0a8c0", "building": "#e4e0da"},
+    "dark": {"background": "#1b1b1b", "water": "#14263a", "landcover": "#1f2a1f", "landuse": "#242424",
+             "road": "#3a3a3a", "road_casing": "#2a2a2a", "boundary": "#5a5570", "building": "#2c2c2c"},
+}
+CONTENT_TYPES = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "webp": "image/webp",
+                 "pbf": "application/vnd.mapbox-vector-tile"}
+
+
+class MBTiles:
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()  # sqlite 연결은 스레드마다 따로
+        meta = dict(self._conn().execute("SELECT name, value FROM metadata").fetchall())
+        self.format = meta.get("format", "png").lower()
+        self.minzoom = int(meta.get("minzoom", 0))
+        self.maxzoom = int(meta.get("maxzoom", 14))
+        self.bounds = [float(v) for v in meta["bounds"].split(",")] if meta.get("bounds") else None
+        self.attribution = meta.get("attribution", "")
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self.local.conn = conn
+        return conn
+
+    @property
+    def content_type(self):
+        return CONTENT_TYPES.get(self.format, "application/octet-stream")
+
+    @property
+    def is_vector(self):
+        return self.format == "pbf"
+
+    def tile(self, z, x, y):
+        # MBTiles는 TMS 기준이라 y를 뒤집어서 찾습니다
+        row = self._conn().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone()
+        return row[0] if row else None
+
+
+def open_basemaps(paths=BASEMAP_PATHS):
+    basemaps = {}
+    for name, path in paths.items():
+        if path and os.path.exists(path):
+            try:
+                basemaps[name] = MBTiles(path)
+            except sqlite3.Error:
+                pass
+    return basemaps
+
+
+def style_json(name, basemap, base_url):
+    tiles_url = f"{base_url}/basemap/{name}/{{z}}/{{x}}/{{y}}"
+    source = {"tiles": [tiles_url], "minzoom": basemap.minzoom, "maxzoom": basemap.maxzoom,
+              "attribution": basemap.attribution}
+    if basemap.bounds:
+        source["bounds"] = basemap.bounds
+    if not basemap.is_vector:
+        source.update(type="raster", tileSize=256)
+        layers = [{"id": "basemap", "type": "raster", "source": "basemap"}]
+    else:
+        source["type"] = "vector"
+        colors = VECTOR_COLORS.get(name, VECTOR_COLORS["light"])
+        layers = [
+            {"id": "background", "type": "background", "paint": {"background-color": colors["background"]}},
+            {"id": "landcover", "type": "fill", "source": "basemap", "source-layer": "landcover",
+             "paint": {"fill-color": colors["landcover"]}},
+            {"id": "landuse", "type": "fill", "source": "basemap", "source-layer": "landuse",
+             "paint": {"fill-color": colors["landuse"]}},
+            {"id": "water", "type": "fill", "source": "basemap", "source-layer": "water",
+             "paint": {"fill-color": colors["water"]}},
+            {"id": "building", "type": "fill", "source": "basemap", "source-layer": "building", "minzoom": 13,
+             "paint": {"fill-color": colors["building"]}},
+            {"id": "road-casing", "type": "line", "source": "basemap", "source-layer": "transportation",
+             "paint": {"line-color": colors["road_casing"], "line-width": 3}},
+            {"id": "road", "type": "line", "source": "basemap", "source-layer": "transportation",
+             "paint": {"line-color": colors["road"], "line-width": 1.5}},
+            {"id": "boundary", "type": "line", "source": "basemap", "source-layer": "boundary",
+             "paint": {"line-color": colors["boundary"], "line-dasharray": [2, 2]}},
+        ]
+    return json.dumps({"version": 8, "name": name, "sources": {"basemap": source}, "layers": layers})
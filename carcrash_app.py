@@ -0,0 +1,287 @@
+import streamlit as st
+import pydeck as pdk
+import plotly.express as px
+from math import radians, sin, cos, sqrt, atan2
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import os
+from gazetteer import Gazetteer
+from hotspot import SEVERITY_PALETTE, rank_hotspots, severity_bands
+from trends import TrendStore
+from crashdata import COORD_DECIMALS, DatasetRegistry
+from prewarm import AccessLog, Prewarmer
+from tileserver import PointTiles, TileServer, TILE_URL, band_color_expression
+from basemap import THEME_STYLES, open_basemaps
+
+# -------------------------
+# 안전지도 공용 데이터/캐시
+# -------------------------
+# 지도 보기·통계 보기 페이지에서만 불러옵니다 (pandas/pydeck/plotly 등 무거운 import 포함).
+
+# -------------------------
+# 거리 계산
+# -------------------------
+def haversine(lat1, lon1, lat2, lon2):
+    R = 6371.0
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    return R * c
+
+# -------------------------
+# 데이터 로드
+# -------------------------
+# CARCRASH_DATA_URL로 로컬 CSV 등 다른 데이터 소스를 지정할 수 있습니다 (부하 테스트용)
+DATA_URL = os.environ.get(
+    "CARCRASH_DATA_URL",
+    "https://drive.google.com/uc?id=1c3ULCZImSX4ns8F9cIE2wVsy8Avup8bu&export=download",
+)
+PLOT_COLUMNS = ["위도", "경도", "sev_score", "사고지역위치명", "사고건수", "사상자수"]
+
+# 정리된 데이터셋은 프로세스에 하나만 두고 모든 세션이 읽기 전용으로 공유합니다.
+# 원본이나 data/drops의 CSV가 바뀌면 바뀐 파티션만 다시 읽어 새 버전으로 바꿔 끼웁니다.
+@st.cache_resource
+def load_data(url=DATA_URL):
+    registry = DatasetRegistry(url)
+    # 지명 사전과 기본 지도/통계 payload는 로드 직후 백그라운드에서 만들기 시작
+    load_gazetteer(*registry.current)
+    load_prewarmer(*registry.current)
+    return registry
+
+def current_dataset():
+    registry = load_data()
+    if st.sidebar.button("🔄 데이터 새로고침"):
+        try:
+            registry.refresh()
+        except Exception as e:
+            registry.last_error = str(e)
+    data_version, dataset = registry.current  # 이번 rerun은 이 버전 하나만 봅니다
+    # 새 버전이면 지명 사전과 미리 만들기도 백그라운드에서 다시 시작
+    load_gazetteer(data_version, dataset)
+    load_prewarmer(data_version, dataset)
+    st.sidebar.caption(f"데이터 버전 {data_version} · {len(dataset):,}행")
+    if registry.last_error:
+        st.sidebar.warning(f"⚠️ 새 데이터를 불러오지 못해 이전 버전을 보여 줍니다: {registry.last_error}")
+    return data_version, dataset
+
+# -------------------------
+# 공통 필터
+# -------------------------
+def sidebar_filters(dataset):
+    # 페이지를 옮겨도 필터 값이 유지되도록 key로 세션에 남겨 둡니다
+    for key in ("filter_years", "filter_types"):
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+    if dataset.year_col:
+        years = dataset.years
+        default = None if "filter_years" in st.session_state else (min(years), max(years))
+        sel_year_range = st.sidebar.slider("연도 범위 선택", min_value=min(years), max_value=max(years),
+                                           value=default, key="filter_years")
+    else:
+        sel_year_range = None
+
+    if dataset.type_col:
+        types = dataset.types
+        default = None if "filter_types" in st.session_state else types
+        sel_types = st.sidebar.multiselect("사고유형 필터", options=types, default=default, key="filter_types")
+    else:
+        sel_types = None
+
+    # 세션에는 선택된 행 번호만 둡니다 (전체 프레임 복사 없음)
+    year_key = tuple(sel_year_range) if sel_year_range and dataset.year_col else None
+    types_key = tuple(sorted(sel_types)) if sel_types and dataset.type_col else None
+    return year_key, types_key, dataset.select(year_key, types_key)
+
+# -------------------------
+# 지명 사전 (제보 위치 → 좌표)
+# -------------------------
+BOUNDARY_PATH = "data/sigungu.geojson"  # 있으면 행정경계 중심점도 사전에 추가
+
+_gazetteer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gazetteer")
+
+# 입력 중인 사용자의 rerun을 막지 않도록 백그라운드에서 만들고 Future를 돌려줍니다
+@st.cache_resource(max_entries=2)
+def load_gazetteer(version, _dataset):
+    boundary_path = BOUNDARY_PATH if os.path.exists(BOUNDARY_PATH) else None
+    return _gazetteer_pool.submit(Gazetteer.from_frame, _dataset.frame, boundary_path)
+
+# -------------------------
+# 사고다발 구역 / 추이 (캐시)
+# -------------------------
+@st.cache_data(max_entries=64)
+def load_hotspots(_dataset, version, year_range, type_set):
+    return rank_hotspots(_dataset.take(_dataset.select(year_range, type_set)))
+
+@st.cache_resource
+def load_trend_store(year_col, type_col, region_col):
+    return TrendStore(year_col, type_col, region_col)
+
+# -------------------------
+# 지도 / 통계 payload (백그라운드 미리 만들기 대상)
+# -------------------------
+class PrebuiltDeck(pdk.Deck):
+    # 직렬화는 한 번만 하고 이후 렌더링에서는 만들어 둔 JSON을 그대로 씁니다
+    def to_json(self):
+        if getattr(self, "_json", None) is None:
+            self._json = super().to_json()
+        return self._json
+
+    def release_data(self):
+        # JSON을 만든 뒤에는 레이어의 행 데이터가 필요 없으므로 비워서
+        # 캐시 예산(JSON 길이)과 실제로 들고 있는 메모리를 맞춥니다
+        self.to_json()
+        for layer in self.layers:
+            layer.data = None
+        return self
+
+# data/basemap/light.mbtiles, dark.mbtiles가 있으면 로컬 타일 서버의 오프라인 배경지도 사용
+@st.cache_resource
+def load_basemaps():
+    return open_basemaps()
+
+def map_style(theme):
+    name = THEME_STYLES[theme]
+    if name in load_basemaps():
+        return f"{TILE_URL}/styles/{name}.json"
+    return "mapbox://styles/mapbox/light-v9" if theme == "밝음 모드" else "mapbox://styles/mapbox/dark-v9"
+
+def build_map(dataset, version, year_range, types, zoom_level, theme, show_hotspots):
+    rows = dataset.select(year_range, types)
+    center = dataset.take(rows, ["위도", "경도"]).mean()
+    center_lat = float(center["위도"])
+    center_lon = float(center["경도"])
+
+    if zoom_level <= 6:
+        plot_rows = dataset.narrow(rows, min_sev=5)
+    elif zoom_level <= 9:
+        plot_rows = dataset.narrow(rows, min_sev=2)
+    else:
+        plot_rows = rows
+    # 점마다 색 리스트 대신 팔레트 번호(uint8)만 보내고 색은 deck.gl 표현식으로 고릅니다.
+    # 좌표는 float32 → 소수 5자리로 잘라 JSON 길이를 줄입니다
+    df_plot = dataset.take(plot_rows, PLOT_COLUMNS).copy()
+    df_plot[["위도", "경도"]] = df_plot[["위도", "경도"]].astype(float).round(COORD_DECIMALS)
+    df_plot["sev_score"] = df_plot["sev_score"].astype(float).round(2)
+    df_plot["band"] = severity_bands(df_plot["sev_score"].to_numpy()).astype("uint8")
+
+    layers = [
+        pdk.Layer(
+            "HeatmapLayer",
+            data=df_plot,
+            get_position=["경도","위도"],
+            aggregation="SUM",
+            weight="sev_score",
+            radiusPixels=60
+        ),
+        pdk.Layer(
+            "ScatterplotLayer",
+            data=df_plot,
+            get_position=["경도","위도"],
+            get_color=band_color_expression(SEVERITY_PALETTE, accessor="band"),
+            get_radius=70,
+            pickable=True
+        )
+    ]
+
+    # 사고다발 구역 폴리곤
+    if show_hotspots:
+        layers.append(
+            pdk.Layer(
+                "PolygonLayer",
+                data=load_hotspots(dataset, version, year_range, types),
+                get_polygon="polygon",
+                get_fill_color=[255, 75, 75, 60],
+                get_line_color=[200, 0, 0, 200],
+                line_width_min_pixels=1,
+                pickable=True
+            )
+        )
+
+    deck = PrebuiltDeck(
+        map_style=map_style(theme),
+        initial_view_state=pdk.ViewState(
+            latitude=center_lat, longitude=center_lon, zoom=zoom_level
+        ),
+        layers=layers,
+        tooltip={"html":"<b>{사고지역위치명}</b><br/>사고건수: {사고건수}<br/>사상자수: {사상자수}",
+                 "style":{"color":"white", "backgroundColor":"#222", "padding":"5px","borderRadius":"5px"}}
+    )
+    return deck.release_data(), len(deck.to_json())
+
+def build_stats(dataset, version, year_range, types, year, region):
+    filtered = dataset.take(dataset.narrow(dataset.select(year_range, types), year=year, region=region))
+    if filtered.empty:
+        return None, 0
+
+    type_col = dataset.type_col
+    stats = {
+        "total_accidents": int(filtered["사고건수"].sum()) if "사고건수" in filtered.columns else len(filtered),
+        "fatalities": int(filtered["사망자수"].sum()) if "사망자수" in filtered.columns else 0,
+        "injuries": int(filtered["사상자수"].sum()) if "사상자수" in filtered.columns else 0,
+        "fig_json": None,
+    }
+    if type_col and type_col in filtered.columns:
+        by_type = filtered.groupby(type_col)["사고건수"].sum().reset_index()
+        fig = px.bar(by_type, x=type_col, y="사고건수", color=type_col,
+                     title=f"{region}({year}) 사고 유형별 현황",
+                     color_discrete_sequence=px.colors.sequential.Agsunset)
+        stats["fig_json"] = fig.to_json()
+    return stats, len(stats["fig_json"] or "") + 200
+
+def default_warm_keys(dataset):
+    # 기본 필터(전체 연도·전체 유형)의 각 줌 레벨 지도와 최근 연도 상위 지역 통계
+    data = dataset.frame
+    full_years = (min(dataset.years), max(dataset.years)) if dataset.year_col else None
+    all_types = tuple(dataset.types) if dataset.type_col else None
+    keys = []
+    if {"위도", "경도"}.issubset(data.columns):
+        keys += [("map", full_years, all_types, z, "밝음 모드", True) for z in range(4, 13)]
+    if dataset.year_col and dataset.region_col and "사고건수" in data.columns:
+        for y in dataset.years[-3:][::-1]:
+            year_rows = dataset.narrow(dataset.select(full_years, all_types), year=y)
+            top = (dataset.take(year_rows, ["region_clean", "사고건수"])
+                   .groupby("region_clean", observed=True)["사고건수"].sum().nlargest(10).index)
+            keys += [("stats", full_years, all_types, y, r) for r in top]
+    return keys
+
+@st.cache_resource(max_entries=2)
+def load_prewarmer(version, _dataset):
+    warmer = Prewarmer({"map": partial(build_map, _dataset, version), "stats": partial(build_stats, _dataset, version)})
+    warmer.warm(default_warm_keys(_dataset))
+    return warmer
+
+# -------------------------
+# 벡터 타일 서버 (처음 켤 때 한 번만 시작)
+# -------------------------
+@st.cache_resource
+def load_tile_server():
+    registry = load_data()
+
+    def build_tiles(ds, year_range, types):
+        subset = ds.take(ds.select(year_range, types), PLOT_COLUMNS)
+        tiles = PointTiles(
+            subset["경도"], subset["위도"], subset["sev_score"],
+            properties={c: subset[c].to_numpy() for c in ["사고지역위치명", "사고건수", "사상자수"] if c in subset.columns},
+            clusters=rank_hotspots(subset),
+        )
+        size = sum(a.nbytes for a in (tiles.mx, tiles.my, tiles.sev, tiles.band, *tiles.properties.values()))
+        if tiles.clusters is not None:
+            size += int(tiles.clusters[2].memory_usage(deep=True).sum())
+        return tiles, size
+
+    # 같은 필터의 타일 요청이 동시에 들어와도 PointTiles는 한 번만 만듭니다 (요청 기록은 남기지 않음)
+    tile_sets = Prewarmer({"tiles": build_tiles}, workers=1, access_log=AccessLog(path=None))
+
+    def source(query):
+        version, ds = registry.current
+        year_range = tuple(int(v) for v in query["years"].split("-")) if query.get("years") else None
+        types = tuple(sorted(query["types"].split("|"))) if query.get("types") else None
+        return f"{version}:{year_range}:{types}", tile_sets.get("tiles", ds, year_range, types)
+
+    try:
+        return TileServer(source, basemaps=load_basemaps()).start()
+    except OSError:
+        # 다른 서버 프로세스가 이미 같은 포트로 타일을 내보내는 중
+        return None
@@ -0,0 +1,73 @@
+import streamlit as st
+from urllib.parse import urlencode
+from startup_profile import mark, timed_import
+
+# -------------------------
+# 지도 보기
+# -------------------------
+st.title("🗺️ 대한민국 사고다발지역 지도")
+mark("제목 표시")
+
+pdk = timed_import("pydeck")
+app = timed_import("carcrash_app")
+from hotspot import SEVERITY_PALETTE
+from tileserver import band_color_expression
+
+data_version, dataset = app.current_dataset()
+year_key, types_key, rows = app.sidebar_filters(dataset)
+theme = st.session_state.get("theme", "밝음 모드")
+mark("데이터/필터")
+
+if app.load_basemaps():
+    app.load_tile_server()
+
+has_latlon = {"위도","경도"}.issubset(dataset.frame.columns)
+if not has_latlon:
+    st.error("⚠️ 위도와 경도 컬럼이 필요합니다.")
+else:
+    zoom_level = st.slider("지도 확대 수준 선택 (줌 레벨)", 4, 12, 6)
+    show_hotspots = st.checkbox("🔥 사고다발 구역 표시", value=True)
+    use_tiles = st.checkbox("🧩 벡터 타일 모드 (화면에 보이는 영역만 불러오기)", value=False)
+    tile_server = app.load_tile_server() if use_tiles else None
+    if use_tiles and tile_server is None:
+        st.warning("⚠️ 타일 서버 포트를 다른 프로세스가 쓰고 있어 기본 지도로 표시합니다.")
+        use_tiles = False
+    if use_tiles:
+        query = {}
+        if year_key:
+            query["years"] = f"{year_key[0]}-{year_key[1]}"
+        if types_key:
+            query["types"] = "|".join(types_key)
+        center = dataset.take(rows, ["위도", "경도"]).mean()
+        deck = pdk.Deck(
+            map_style=app.map_style(theme),
+            initial_view_state=pdk.ViewState(
+                latitude=float(center["위도"]), longitude=float(center["경도"]), zoom=zoom_level
+            ),
+            layers=[
+                pdk.Layer(
+                    "MVTLayer",
+                    data=f"{tile_server.url}/tiles/{{z}}/{{x}}/{{y}}.pbf" + (f"?{urlencode(query)}" if query else ""),
+                    binary=False,
+                    get_fill_color=band_color_expression(SEVERITY_PALETTE),
+                    point_radius_min_pixels=3,
+                    get_point_radius=70,
+                    pickable=True
+                )
+            ],
+            tooltip={"html":"사고건수: {사고건수}<br/>심각도: {sev}",
+                     "style":{"color":"white", "backgroundColor":"#222", "padding":"5px","borderRadius":"5px"}}
+        )
+    else:
+        deck = app.load_prewarmer(data_version, dataset).get("map", year_key, types_key, zoom_level, theme, show_hotspots)
+    if show_hotspots:
+        hotspots = app.load_hotspots(dataset, data_version, year_key, types_key)
+    st.pydeck_chart(deck, use_container_width=True)
+    mark("지도 표시")
+
+    if show_hotspots:
+        st.markdown("### 🔥 사고다발 구역 순위")
+        st.dataframe(hotspots.drop(columns=["polygon"]).head(30), use_container_width=True, hide_index=True)
+
+    st.markdown("### 🚗 안전 경로 추천 (예시)")
+    st.info("출발지와 목적지를 선택하면 사고율이 낮은 도로를 추천하도록 확장할 수 있습니다.", icon="⚡️")
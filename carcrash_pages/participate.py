@@ -0,0 +1,44 @@
+import streamlit as st
+from startup_profile import mark, timed_import
+
+# -------------------------
+# 시민 참여
+# -------------------------
+# 사고 데이터가 필요 없는 페이지라 지명 사전을 쓸 때만 데이터를 불러옵니다.
+st.title("🙋 시민 참여 공간")
+mark("제목 표시")
+tab1, tab2, tab3 = st.tabs(["🚨 위험 구역 제보", "🧱 개선 요청 게시판", "🚸 교통안전 캠페인 참여"])
+
+with tab1:
+    st.subheader("🚨 위험 구역 제보")
+    region = st.text_input("📍 위치/지역명")
+    if region:
+        app = timed_import("carcrash_app")
+        gazetteer = app.load_gazetteer(*app.load_data().current)
+        hits = gazetteer.result().suggest(region) if gazetteer.done() else None
+        if hits is None:
+            st.caption("⏳ 지명 사전을 준비하고 있습니다. 잠시 후 다시 입력해 보세요.")
+        elif hits:
+            place = hits[0]
+            st.caption(f"📌 {place.sigungu} · 위도 {place.lat:.5f}, 경도 {place.lon:.5f}")
+            if len(hits) > 1:
+                st.caption("비슷한 지명: " + ", ".join(h.name for h in hits[1:]))
+        else:
+            st.caption("⚠️ 사전에서 찾을 수 없는 지명입니다.")
+    issue_type = st.selectbox("🚧 문제 유형", ["신호등 고장","가로등 부족","횡단보도 없음","도로 파손","기타"])
+    detail = st.text_area("📝 상세 설명")
+    if st.button("제보 제출"):
+        st.success("✅ 제보가 접수되었습니다.")
+
+with tab2:
+    st.subheader("🧱 개선 요청 게시판")
+    title = st.text_input("제목")
+    content = st.text_area("내용")
+    if st.button("요청 등록"):
+        st.success("✅ 요청이 등록되었습니다.")
+
+with tab3:
+    st.subheader("🚸 교통안전 캠페인 참여")
+    choice = st.radio("캠페인 선택", ["보행자 우선 캠페인","음주운전 근절 서약","안전벨트 착용 인증"])
+    if st.button("참여하기"):
+        st.success("✅ 참여 완료!")
@@ -0,0 +1,129 @@
+import streamlit as st
+from startup_profile import mark, timed_import
+
+# -------------------------
+# 통계 보기 (지역명 숫자 제거 및 합산)
+# -------------------------
+st.title("📊 사고 통계 분석")
+mark("제목 표시")
+
+np = timed_import("numpy")
+pd = timed_import("pandas")
+px = timed_import("plotly.express")
+pio = timed_import("plotly.io")
+app = timed_import("carcrash_app")
+from trends import worst_rising
+
+data_version, dataset = app.current_dataset()
+year_key, types_key, rows = app.sidebar_filters(dataset)
+year_col = dataset.year_col
+type_col = dataset.type_col
+region_col = dataset.region_col
+mark("데이터/필터")
+
+stats_mode = st.radio("보기 방식", ["단일 지역", "지역 비교"], horizontal=True)
+
+if stats_mode == "지역 비교":
+    # 여러 지역 × 연도 범위: 필터당 한 번 만든 집계 큐브에서 골라 보기만 합니다
+    cube = dataset.cube(year_key, types_key)
+    all_regions = list(dataset.regions) if dataset.regions is not None else []
+    region_totals = cube[..., 0].sum(axis=(1, 2))
+    default_regions = [all_regions[i] for i in region_totals.argsort()[::-1][:5] if region_totals[i] > 0]
+    cmp_regions = st.multiselect("비교할 지역 선택", all_regions, default=default_regions)
+    # 큐브는 사이드바 연도 범위로 만들었으므로 비교 연도도 그 안에서만 고릅니다
+    cube_years = [y for y in dataset.years if year_key is None or year_key[0] <= y <= year_key[1]]
+    if year_col and len(cube_years) > 1:
+        cmp_years = st.slider("비교 연도 범위", min_value=min(cube_years), max_value=max(cube_years),
+                              value=(min(cube_years), max(cube_years)))
+    else:
+        cmp_years = (cube_years[0], cube_years[0]) if year_col and cube_years else None
+
+    if not cmp_regions:
+        st.info("비교할 지역을 선택하세요.")
+    else:
+        region_idx = dataset.regions.get_indexer(cmp_regions)
+        year_mask = np.ones(cube.shape[1], dtype=bool)
+        if cmp_years:
+            year_mask = (np.array(dataset.years) >= cmp_years[0]) & (np.array(dataset.years) <= cmp_years[1])
+        sub = cube[region_idx][:, year_mask]
+        sub_years = np.array(dataset.years)[year_mask] if year_col else []
+        values = dataset.cube_values
+
+        # 지역별 지표 나란히
+        totals = sub.sum(axis=(1, 2))
+        summary = pd.DataFrame(totals.astype(int), columns=values, index=cmp_regions)
+        summary.index.name = "지역"
+        st.dataframe(summary.sort_values("사고건수", ascending=False), use_container_width=True)
+
+        # 지역별 사고유형 누적 막대
+        if type_col:
+            by_type = sub[..., 0].sum(axis=1)
+            long = pd.DataFrame(by_type, index=cmp_regions, columns=dataset.types).stack().reset_index()
+            long.columns = ["지역", type_col, "사고건수"]
+            fig = px.bar(long, x="지역", y="사고건수", color=type_col, barmode="stack",
+                         title="지역별 사고 유형 구성",
+                         color_discrete_sequence=px.colors.sequential.Agsunset)
+            st.plotly_chart(fig, use_container_width=True)
+
+        # 연도별 추이
+        if year_col and len(sub_years) > 0:
+            by_year = sub[..., 0].sum(axis=2)
+            long = pd.DataFrame(by_year, index=cmp_regions, columns=sub_years).stack().reset_index()
+            long.columns = ["지역", "연도", "사고건수"]
+            fig = px.line(long, x="연도", y="사고건수", color="지역", markers=True, title="연도별 사고 건수 추이")
+            st.plotly_chart(fig, use_container_width=True)
+else:
+    # 사고 발생 연도 선택
+    if year_col:
+        year_list = dataset.years_in(rows)
+        selected_year = st.selectbox("사고 발생 연도 선택", year_list)
+    else:
+        selected_year = None
+
+    # 사고 발생 지역 (숫자 제거하여 동일 지역 통합한 region_clean은 로드할 때 계산)
+    if region_col:
+        regions = dataset.regions_in(rows)
+        selected_region = st.selectbox("사고 발생 지역 선택", regions)
+    else:
+        selected_region = None
+
+    # 선택 조건의 집계와 그림 (미리 만들어 둔 것이 있으면 재사용)
+    stats = app.load_prewarmer(data_version, dataset).get(
+        "stats", year_key, types_key,
+        selected_year if year_col else None, selected_region if region_col else None)
+
+    # 동일 지역 합산
+    if stats is not None:
+        st.subheader(f"📍 {selected_region} 지역 ({selected_year}년) 사고 통계")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🚗 사고 건수", f"{stats['total_accidents']:,}건")
+        col2.metric("☠️ 사망자수", f"{stats['fatalities']:,}명")
+        col3.metric("🤕 부상자수", f"{stats['injuries']:,}명")
+
+        if stats["fig_json"]:
+            st.plotly_chart(pio.from_json(stats["fig_json"]), use_container_width=True)
+    else:
+        st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
+mark("통계 표시")
+
+# 전체 지역 × 사고유형 전년 대비 추이 (새 연도만 추가 집계)
+if year_col and region_col:
+    st.markdown("---")
+    st.subheader("📈 악화 지역 순위 (전년 대비)")
+    trend_store = app.load_trend_store(year_col, type_col, region_col)
+    scored = trend_store.update(dataset.frame, refresh_years=app.load_data().changed_years(trend_store.version),
+                                version=data_version)
+    trend_years = sorted(scored["year"].unique())[1:]
+    if trend_years:
+        trend_year = st.selectbox("기준 연도", trend_years[::-1])
+        trend_type = st.selectbox("사고유형", ["전체 유형"] + sorted(scored["type"].unique()))
+        # 전체 유형: 지역마다 유형을 합친 합계의 추이 (지역당 한 줄)
+        ranked = trend_store.scored_total if trend_type == "전체 유형" else scored[scored["type"] == trend_type]
+        ranked = worst_rising(ranked, year=trend_year, top_n=30)
+        st.dataframe(
+            ranked.rename(columns={"region": "지역", "type": "사고유형", "year": "연도", "prev": "전년",
+                                   "change": "증감", "change_pct": "증감률(%)", "anomaly": "이상치 점수"}),
+            use_container_width=True, hide_index=True
+        )
+    else:
+        st.info("비교할 수 있는 연도가 2개 이상 필요합니다.")
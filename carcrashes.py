@@ -1,12 +1,25 @@
+import os
 import streamlit as st
 import pandas as pd
 import pydeck as pdk
 from datetime import datetime
+from tileserver import PointTiles, TileServer, band_color_expression
+from basemap import open_basemaps
+from hotspot import SEVERITY_PALETTE
+
+# 안전지도 앱(carcrash.py)의 타일 서버와 겹치지 않도록 포트를 따로 씁니다
+TILE_PORT = int(os.environ.get("CARCRASHES_TILE_PORT", "8766"))
+TILE_URL = f"http://localhost:{TILE_PORT}"
 
 # ---------------------------
-# 1️⃣ Mapbox 토큰 불러오기
+# 1️⃣ Mapbox 토큰 불러오기 (오프라인 배경지도가 있으면 필요 없음)
 # ---------------------------
-MAPBOX_API_KEY = st.secrets["MAPBOX_API_KEY"]
+@st.cache_resource
+def load_basemaps():
+    return open_basemaps()
+
+basemaps = load_basemaps()
+MAPBOX_API_KEY = None if "light" in basemaps else st.secrets["MAPBOX_API_KEY"]
 
 # ---------------------------
 # 2️⃣ 데이터 불러오기 (또는 예시 데이터)
@@ -26,6 +39,8 @@ except FileNotFoundError:
 # 예: 시간대별 필터, 구 선택, 사고유형 분석 등
 # ----------------------------------------------------------
 # 아래 예시는 기존 코드 일부 예시 구조 (예린씨 코드에 맞게 수정)
+raw_data = data  # 벡터 타일은 시간대 필터 전 전체 데이터에서 만듭니다
+selected_hour = None
 if "발생일시" in data.columns:
     data["발생일시"] = pd.to_datetime(data["발생일시"])
     selected_hour = st.slider("시간대 선택", 0, 23, 12)
@@ -35,7 +50,10 @@ if "발생일시" in data.columns:
 # ---------------------------
 # 3️⃣ 지도 스타일 및 위치 설정
 # ---------------------------
-MAPBOX_STYLE = "mapbox://styles/mapbox/light-v11"  # 연한 회색 도로지도
+if "light" in basemaps:
+    MAPBOX_STYLE = f"{TILE_URL}/styles/light.json"  # data/basemap/light.mbtiles
+else:
+    MAPBOX_STYLE = "mapbox://styles/mapbox/light-v11"  # 연한 회색 도로지도
 
 view_state = pdk.ViewState(
     latitude=data["lat"].mean(),
@@ -57,7 +75,39 @@ layer = pdk.Layer(
 )
 
 # ---------------------------
-# 5️⃣ 지도 만들기 (이동/확대 제한)
+# 4️⃣-2 벡터 타일 서버 (브라우저가 보이는 타일만 받아 가므로 이동/확대 가능)
+# ---------------------------
+@st.cache_resource
+def load_tile_server(_raw):
+    tiles = {}
+
+    def source(query):
+        hour = query.get("hour")
+        if hour not in tiles:
+            df = _raw if hour is None or "발생일시" not in _raw.columns else _raw[_raw["발생일시"].dt.hour == int(hour)]
+            counts = df["사고건수"] if "사고건수" in df.columns else pd.Series(1, index=df.index)
+            tiles[hour] = PointTiles(df["lon"], df["lat"], counts, properties={"사고건수": counts.to_numpy()})
+        return f"{len(_raw)}:{hour}", tiles[hour]
+
+    try:
+        return TileServer(source, port=TILE_PORT, basemaps=basemaps, url=TILE_URL).start()
+    except OSError:
+        return None
+
+use_tiles = load_tile_server(raw_data) is not None
+if use_tiles:
+    layer = pdk.Layer(
+        "MVTLayer",
+        data=f"{TILE_URL}/tiles/{{z}}/{{x}}/{{y}}.pbf" + (f"?hour={selected_hour}" if selected_hour is not None else ""),
+        binary=False,
+        get_fill_color=band_color_expression(SEVERITY_PALETTE),
+        point_radius_min_pixels=3,
+        get_point_radius=60,
+        pickable=True
+    )
+
+# ---------------------------
+# 5️⃣ 지도 만들기 (타일 서버가 없으면 이동/확대 제한)
 # ---------------------------
 deck = pdk.Deck(
     map_style=MAPBOX_STYLE,
@@ -65,7 +115,7 @@ deck = pdk.Deck(
     initial_view_state=view_state,
     layers=[layer],
     tooltip={"text": "사고건수: {사고건수}건"},
-    interactive=False  # 확대/이동 불가능하게
+    interactive=use_tiles  # 타일 모드에서만 확대/이동 허용
 )
 
 # ---------------------------
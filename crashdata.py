@@ -0,0 +1,442 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from hotspot import severity_scores
+from gazetteer import clean_regions
+from trends import find_region_col
+
+# -------------------------
+# 공유 사고 데이터셋 (읽기 전용)
+# -------------------------
+# 정리한 데이터는 프로세스당 한 번만 메모리에 올리고 모든 세션이 같이 씁니다.
+# 세션별 필터 결과는 행 번호 배열로만 들고, 실제 행은 그릴 때 필요한 만큼만 꺼냅니다.
+# ARROW_PATH를 지정하면 Arrow 파일을 메모리 맵으로 열어 여러 서버 프로세스가
+# 같은 페이지를 공유합니다 (pyarrow 필요).
+
+ARROW_PATH = os.environ.get("CARCRASH_ARROW_PATH")
+DROP_DIR = os.environ.get("CARCRASH_DROP_DIR", "data/drops")  # 추가 연도 CSV를 넣는 폴더
+REFRESH_SECONDS = float(os.environ.get("CARCRASH_REFRESH_SECONDS", "300"))
+ARROW_LOCK_SECONDS = 120  # 다른 프로세스가 Arrow 파일을 만드는 동안 기다리는 최대 시간
+CUBE_VALUES = ["사고건수", "사망자수", "사상자수"]
+
+# 적재 시 압축 저장: 좌표는 float32(국내 경위도에서 1m 안쪽 정밀도), 인원/건수는 uint16,
+# 심각도는 float32. 대한민국 범위를 벗어난 좌표와 완전히 같은 중복 행은 버립니다.
+KOREA_BOUNDS = {"위도": (33.0, 38.7), "경도": (124.5, 132.0)}
+COUNT_COLUMNS = ["사고건수", "사망자수", "중상자수", "경상자수", "부상신고자수", "사상자수"]
+COORD_DECIMALS = 5  # 지도 payload로 보낼 때 좌표 자릿수 (약 1m)
+
+
+def read_source(url):
+    try:
+        df = pd.read_csv(url, encoding="utf-8")
+    except:
+        df = pd.read_csv(url, encoding="cp949")
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def compact(df):
+    """범위 밖/중복 행을 버리고 좌표·건수 컬럼을 작은 dtype으로"""
+    df = df.drop_duplicates()
+    coords = {col: pd.to_numeric(df[col], errors="coerce") for col in KOREA_BOUNDS if col in df.columns}
+    keep = np.ones(len(df), dtype=bool)
+    for col, values in coords.items():
+        lo, hi = KOREA_BOUNDS[col]
+        # 좌표가 비어 있는 행은 통계에 쓰이므로 남겨 둡니다
+        keep &= (values.isna() | values.between(lo, hi)).to_numpy()
+    df = df[keep].copy()
+    for col, values in coords.items():
+        df[col] = values[keep].to_numpy(dtype=np.float32)
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors="coerce").fillna(0)
+            df[col] = values.clip(0, np.iinfo(np.uint16).max).astype(np.uint16)
+    return df.reset_index(drop=True)
+
+
+def prepare(df):
+    """세션마다 만들던 파생 컬럼(sev_score, region_clean)을 한 번만 계산"""
+    df = compact(df)
+    df["sev_score"] = severity_scores(df).astype(np.float32)
+    region_col = find_region_col(df)
+    if region_col:
+        df["region_clean"] = clean_regions(df[region_col]).astype("category")
+    return df
+
+
+def _freeze(arr):
+    arr.flags.writeable = False
+    return arr
+
+
+def _write_arrow(df, path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="uncompressed")
+    # 이미 있는 파일은 다른 프로세스가 메모리 맵으로 쓰는 중일 수 있으므로 덮어쓰지 않습니다
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    except OSError:
+        if not os.path.exists(path):
+            os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _read_arrow(path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    # 메모리 맵: 숫자 컬럼은 OS 페이지 캐시를 그대로 가리킵니다
+    table = feather.read_table(pa.memory_map(path, "r"), memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedDataset:
+    def __init__(self, frame):
+        self.frame = frame
+        columns = frame.columns
+        self.year_col = "사고연도" if "사고연도" in columns else ("연도" if "연도" in columns else None)
+        self.type_col = "사고유형구분" if "사고유형구분" in columns else None
+        self.region_col = find_region_col(frame)
+
+        self.years = []
+        self._year = None
+        if self.year_col:
+            self._year = _freeze(pd.to_numeric(frame[self.year_col], errors="coerce").to_numpy(dtype=float))
+            self.years = sorted(int(y) for y in np.unique(self._year[~np.isnan(self._year)]))
+            year_idx = np.searchsorted(self.years, np.nan_to_num(self._year, nan=-1))
+            self._year_codes = _freeze(np.where(np.isin(self._year, self.years), year_idx, -1))
+
+        self.types = []
+        self._type_codes = None
+        if self.type_col:
+            types = frame[self.type_col].astype("category")
+            self.types = sorted(types.cat.categories)
+            self._type_index = {t: i for i, t in enumerate(types.cat.categories)}
+            self._type_codes = _freeze(types.cat.codes.to_numpy())
+
+        self.sev = _freeze(frame["sev_score"].to_numpy(dtype=np.float32)) if "sev_score" in columns else None
+        self.regions = None
+        if "region_clean" in columns:
+            self.regions = frame["region_clean"].cat.categories
+            self._region_codes = _freeze(frame["region_clean"].cat.codes.to_numpy())
+
+        # 집계 큐브에 쓰는 값 컬럼 (없으면 사고건수는 1건씩). uint16 건수 컬럼은 복사 없이 그대로 씁니다
+        self.cube_values = CUBE_VALUES
+        self._values = []
+        for c in CUBE_VALUES:
+            if c not in columns:
+                values = np.ones(len(frame), dtype=np.uint8) if c == "사고건수" else np.zeros(len(frame), dtype=np.uint8)
+            elif frame[c].dtype == np.uint16:
+                values = frame[c].to_numpy()
+            else:
+                values = pd.to_numeric(frame[c], errors="coerce").fillna(0).to_numpy(dtype=float)
+            self._values.append(_freeze(values))
+
+        # 같은 필터를 고른 세션끼리는 같은 행 번호 배열/집계를 공유
+        self._select = lru_cache(maxsize=128)(self._select_uncached)
+        self._cube = lru_cache(maxsize=32)(self._cube_uncached)
+
+    def __len__(self):
+        return len(self.frame)
+
+    # -------------------------
+    # 행 번호 선택
+    # -------------------------
+    def _select_uncached(self, year_range, types):
+        mask = np.ones(len(self.frame), dtype=bool)
+        if year_range and self._year is not None:
+            mask &= (self._year >= year_range[0]) & (self._year <= year_range[1])
+        if types is not None and self._type_codes is not None:
+            codes = [self._type_index[t] for t in types if t in self._type_index]
+            mask &= np.isin(self._type_codes, codes)
+        return _freeze(np.flatnonzero(mask).astype(np.int32))
+
+    def select(self, year_range=None, types=None):
+        year_range = tuple(year_range) if year_range else None
+        types = tuple(sorted(types)) if types is not None else None
+        return self._select(year_range, types)
+
+    def narrow(self, rows, year=None, region=None, min_sev=None):
+        """이미 고른 행 번호 안에서 더 좁히기"""
+        keep = np.ones(len(rows), dtype=bool)
+        if year is not None and self._year is not None:
+            keep &= self._year[rows] == year
+        if region is not None and self.regions is not None:
+            code = self.regions.get_indexer([region])[0]
+            keep &= self._region_codes[rows] == code
+        if min_sev is not None and self.sev is not None:
+            keep &= self.sev[rows] >= min_sev
+        return rows[keep]
+
+    def years_in(self, rows):
+        if self._year is None:
+            return []
+        years = self._year[rows]
+        return sorted(int(y) for y in np.unique(years[~np.isnan(years)]))
+
+    def regions_in(self, rows):
+        if self.regions is None:
+            return []
+        codes = np.unique(self._region_codes[rows])
+        return sorted(self.regions[codes[codes >= 0]])
+
+    # -------------------------
+    # 지역 × 연도 × 유형 집계 큐브
+    # -------------------------
+    def _cube_uncached(self, year_range, types):
+        rows = self._select(year_range, types)
+        n_regions = len(self.regions) if self.regions is not None else 1
+        n_years = max(len(self.years), 1)
+        n_types = max(len(self.types), 1)
+        region = self._region_codes[rows] if self.regions is not None else np.zeros(len(rows), dtype=int)
+        year = self._year_codes[rows] if self._year is not None else np.zeros(len(rows), dtype=int)
+        kind = self._type_codes[rows] if self._type_codes is not None else np.zeros(len(rows), dtype=int)
+
+        ok = (region >= 0) & (year >= 0) & (kind >= 0)
+        cell = (region[ok].astype(np.int64) * n_years + year[ok]) * n_types + kind[ok]
+        size = n_regions * n_years * n_types
+        cube = np.stack(
+            [np.bincount(cell, weights=v[rows][ok], minlength=size) for v in self._values], axis=-1
+        ).reshape(n_regions, n_years, n_types, len(self._values))
+        return _freeze(cube)
+
+    def cube(self, year_range=None, types=None):
+        """필터 결과를 (지역, 연도, 유형, 값) 배열로 한 번에 집계 (값 순서는 cube_values)"""
+        year_range = tuple(year_range) if year_range else None
+        types = tuple(sorted(types)) if types is not None else None
+        return self._cube(year_range, types)
+
+    def take(self, rows, columns=None):
+        """행 번호에 해당하는 행만 꺼낸 작은 프레임 (그리기/집계용)"""
+        if columns is None:
+            return self.frame.take(rows)
+        positions = [self.frame.columns.get_loc(c) for c in columns if c in self.frame.columns]
+        return self.frame.iloc[rows, positions]
+
+
+# -------------------------
+# 증분 새로고침
+# -------------------------
+# 원본 URL과 DROP_DIR의 CSV 하나하나를 파티션으로 보고, 크기/수정시각(원격은 ETag 등)이
+# 바뀐 파티션만 다시 읽어 기존 행과 바꿔 끼웁니다. 새 버전은 (version, dataset) 튜플을
+# 한 번에 바꿔 넣으므로, 실행 중인 세션은 다음 rerun부터 새 버전을 봅니다.
+
+def fingerprint(source):
+    if os.path.exists(source):
+        stat = os.stat(source)
+        return [stat.st_size, stat.st_mtime_ns]
+    try:
+        import requests
+
+        resp = requests.head(source, allow_redirects=True, timeout=5)
+        headers = resp.headers
+        fp = [headers.get("ETag"), headers.get("Last-Modified"), headers.get("Content-Length")]
+        return fp if any(fp) else None
+    except Exception:
+        return None
+
+
+def _touched_years(dataset, frame, sources):
+    """sources 파티션에 속한 연도 (이전 버전과 새 프레임 양쪽)"""
+    if dataset is None or not dataset.year_col:
+        return set()
+    touched = set()
+    for df in (dataset.frame, frame):
+        if "source" in df.columns and dataset.year_col in df.columns:
+            years = df.loc[df["source"].isin(sources), dataset.year_col]
+            touched |= set(pd.to_numeric(years, errors="coerce").dropna().astype(int))
+    return touched
+
+
+class DatasetRegistry:
+    def __init__(self, url, drop_dir=DROP_DIR, arrow_path=ARROW_PATH, poll_seconds=REFRESH_SECONDS):
+        self.url = url
+        self.drop_dir = drop_dir
+        self.arrow_path = arrow_path
+        self.fingerprints = {}
+        self.changes = []  # (version, 바뀐 연도들)
+        self.current = (0, None)
+        self.last_error = None
+        self.lock = threading.Lock()
+        self.refresh()
+        if poll_seconds > 0:
+            threading.Thread(target=self._poll, args=(poll_seconds,), daemon=True).start()
+
+    @property
+    def version(self):
+        return self.current[0]
+
+    @property
+    def dataset(self):
+        return self.current[1]
+
+    def sources(self):
+        drops = sorted(glob.glob(os.path.join(self.drop_dir, "*.csv"))) if self.drop_dir else []
+        return [self.url] + drops
+
+    def changed_years(self, since):
+        """since 버전 이후로 내용이 바뀐 연도 (since가 None이면 전부 새로)"""
+        if since is None:
+            return set()
+        return {y for version, years in self.changes if version > since for y in years}
+
+    def _poll(self, seconds):
+        while True:
+            time.sleep(seconds)
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def refresh(self):
+        """바뀐 파티션이 있으면 새 버전을 만들고 True"""
+        with self.lock:
+            version, dataset = self.current
+            sources = self.sources()
+            prints = {src: fingerprint(src) for src in sources}
+            # 원격 지문을 못 얻으면(None) 처음 한 번만 읽습니다
+            changed = [src for src in sources
+                       if src not in self.fingerprints or (prints[src] is not None and prints[src] != self.fingerprints[src])]
+            removed = [src for src in self.fingerprints if src not in prints]
+            if dataset is not None and not changed and not removed:
+                return False
+
+            # 같은 지문 조합을 다른 프로세스가 이미 만들었으면 다시 읽지 않고 그 파일을 메모리 맵
+            touched = None
+            frame = self._load_arrow(prints)
+            if frame is None:
+                with self._arrow_lock(prints):
+                    frame = self._load_arrow(prints)  # 잠금을 기다리는 동안 만들어졌을 수 있음
+                    if frame is None:
+                        frame, touched = self._merge(dataset, changed + removed, changed)
+                        frame = self._write_arrow(frame, prints)
+            if touched is None:
+                touched = _touched_years(dataset, frame, changed + removed)
+
+            self.fingerprints = {src: prints[src] if prints[src] is not None else self.fingerprints.get(src, [])
+                                 for src in sources}
+            self.changes.append((version + 1, touched))
+            self.current = (version + 1, SharedDataset(frame))
+            self.last_error = None
+            self._remove_stale_arrow(prints)
+            return True
+
+    def _merge(self, dataset, drop_sources, read_sources):
+        old = dataset.frame if dataset is not None else None
+        year_col = dataset.year_col if dataset is not None else None
+        touched = set()
+        parts = []
+        if old is not None:
+            stale = old["source"].isin(drop_sources)
+            if year_col:
+                touched |= set(pd.to_numeric(old.loc[stale, year_col], errors="coerce").dropna().astype(int))
+            parts.append(old[~stale])
+        for src in read_sources:
+            part = prepare(read_source(src))
+            part["source"] = src
+            year_col = year_col or next((c for c in ("사고연도", "연도") if c in part.columns), None)
+            if year_col and year_col in part.columns:
+                touched |= set(pd.to_numeric(part[year_col], errors="coerce").dropna().astype(int))
+            parts.append(part)
+
+        if len(parts) > 1:
+            frame = pd.concat(parts, ignore_index=True)
+            # compact()는 파일 하나 안의 중복만 지우므로 여러 파일에 걸친 같은 행도 합친 뒤 한 번 더 지웁니다
+            frame = frame.drop_duplicates(subset=[c for c in frame.columns if c != "source"], ignore_index=True)
+        else:
+            frame = parts[0].reset_index(drop=True)
+        for col in ("source", "region_clean"):
+            if col in frame.columns and frame[col].dtype.name != "category":
+                frame[col] = frame[col].astype(str).astype("category")
+        return frame, touched
+
+    # 여러 서버 프로세스: 같은 지문 조합의 Arrow 파일이 있으면 다시 읽지 않고 메모리 맵
+    def _arrow_file(self, prints):
+        digest = hashlib.sha1(json.dumps(sorted(prints.items()), default=str).encode()).hexdigest()[:12]
+        base, ext = os.path.splitext(self.arrow_path)
+        return f"{base}.{digest}{ext or '.arrow'}"
+
+    def _remove_stale_arrow(self, prints):
+        # 새 버전을 내보낸 뒤 이전 지문 조합의 Arrow 파일 정리
+        # (이미 메모리 맵으로 연 프로세스는 닫을 때까지 그대로 읽을 수 있습니다)
+        if not self.arrow_path or None in prints.values():
+            return
+        keep = self._arrow_file(prints)
+        base, ext = os.path.splitext(self.arrow_path)
+        pattern = re.compile(re.escape(base) + r"\.[0-9a-f]{12}" + re.escape(ext or ".arrow") + "$")
+        for path in glob.glob(f"{glob.escape(base)}.*{ext or '.arrow'}"):
+            if path != keep and pattern.match(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @contextmanager
+    def _arrow_lock(self, prints):
+        # 같은 지문 조합은 한 프로세스만 CSV를 파싱해 Arrow 파일을 만들고, 나머지는 기다렸다가 읽습니다
+        if not self.arrow_path or None in prints.values():
+            yield
+            return
+        path = self._arrow_file(prints)
+        lock = f"{path}.lock"
+        deadline = time.monotonic() + ARROW_LOCK_SECONDS
+        owner = False
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                owner = True
+                break
+            except FileExistsError:
+                # 다른 프로세스가 다 만들었거나, 잠금이 너무 오래되면(중단된 프로세스) 직접 만듭니다
+                if os.path.exists(path) or time.monotonic() > deadline:
+                    break
+                time.sleep(0.2)
+            except OSError:
+                break
+        try:
+            yield
+        finally:
+            if owner:
+                try:
+                    os.remove(lock)
+                except OSError:
+                    pass
+
+    def _load_arrow(self, prints):
+        if not self.arrow_path or None in prints.values():
+            return None
+        path = self._arrow_file(prints)
+        if not os.path.exists(path):
+            return None
+        try:
+            return _read_arrow(path)
+        except (ImportError, OSError):
+            # pyarrow가 없거나, 읽기 직전에 새 버전으로 바뀌며 지워진 파일
+            return None
+
+    def _write_arrow(self, frame, prints):
+        if not self.arrow_path or None in prints.values():
+            return frame
+        try:
+            path = self._arrow_file(prints)
+            _write_arrow(frame, path)
+            return _read_arrow(path)
+        except ImportError:
+            return frame
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from moodart import mood_art_png
+from moodstats import WEEKDAYS, MoodRollups
 
 st.set_page_config(
     page_title="패턴 관찰기 | Yerin’s Pink Pattern",
@@ -53,13 +55,27 @@ color_map = {
 }
 color = color_map.get(mood, "#ffcce6")
 
+# --- 전체 사용자 집계 (익명, 시간별/일별 합계만 저장) ---
+@st.cache_resource
+def load_rollups():
+    return MoodRollups()
+
+@st.cache_data(ttl=60)
+def load_aggregates(since):
+    rollups = load_rollups()
+    return rollups.mood_by_hour(since), rollups.energy_by_weekday(since), rollups.total()
+
 # --- 데이터 저장 ---
 if "data" not in st.session_state:
     st.session_state["data"] = pd.DataFrame(columns=["time", "mood", "energy", "color"])
+    st.session_state["data_version"] = 0  # 기록이 바뀔 때마다 1씩 (그림 캐시 키)
 
 if st.button("🌷 기록하기"):
     new_entry = pd.DataFrame([[time_now, mood, energy, color]], columns=["time", "mood", "energy", "color"])
     st.session_state["data"] = pd.concat([st.session_state["data"], new_entry], ignore_index=True)
+    st.session_state["data_version"] += 1
+    load_rollups().record(time_now, mood, energy)
+    load_aggregates.clear()
     st.success("오늘의 기록이 저장되었습니다! 🌸")
 
 # --- 시각화 ---
@@ -67,30 +83,22 @@ if len(st.session_state["data"]) > 0:
     st.subheader("2️⃣ 오늘의 감정 패턴")
     df = st.session_state["data"]
 
-    # Streamlit 컬럼으로 그라데이션 블록 시각화
-    cols = st.columns(len(df))
-    for i, row in enumerate(df.itertuples(index=False)):  # index=False로 컬럼명 그대로 사용 가능
-        with cols[i]:
-            st.markdown(f"""
-            <div style="
-                background:{row.color};
-                height:100px;
-                border-radius:12px;
-                margin-bottom:6px;
-                display:flex;
-                align-items:center;
-                justify-content:center;
-                color:white;
-                font-weight:bold;
-                font-size:15px;
-            ">
-            {row.mood} ✨ {row.energy}/10
-            </div>
-            """, unsafe_allow_html=True)
+    # 기록 전체를 한 장의 그라데이션 그림으로 (기록이 바뀐 경우에만 다시 그림)
+    version = st.session_state["data_version"]
+    art = st.session_state.get("art")
+    if art is None or art[0] != version:
+        art = (version, mood_art_png(df))
+        st.session_state["art"] = art
+    st.image(art[1], use_container_width=True,
+             caption=f"{df['time'].iloc[0]} ~ {df['time'].iloc[-1]} · 기록 {len(df)}개")
+    st.download_button("🖼️ 작품 저장하기 (PNG)", art[1], file_name="pink_pattern.png", mime="image/png")
 
     # --- 감정 기록 카드 ---
     st.markdown("#### 📊 기록 카드")
-    for row in df.itertuples(index=False):
+    recent = df.tail(20)  # 최근 기록만 카드로
+    if len(df) > len(recent):
+        st.caption(f"최근 {len(recent)}개만 표시합니다 (전체 {len(df)}개).")
+    for row in recent.itertuples(index=False):
         st.markdown(f"""
         <div style="display:flex; align-items:center; margin-bottom:6px; padding:4px;">
             <div style="width:35px; height:35px; background:{row.color}; border-radius:50%; margin-right:12px;"></div>
@@ -98,6 +106,25 @@ if len(st.session_state["data"]) > 0:
         </div>
         """, unsafe_allow_html=True)
 
+# --- 모두의 감정 패턴 ---
+st.subheader("3️⃣ 모두의 감정 패턴")
+period = st.radio("기간", ["최근 30일", "전체"], horizontal=True)
+since = (pd.Timestamp.now() - pd.Timedelta(days=30)).strftime("%Y-%m-%d") if period == "최근 30일" else None
+by_hour, by_weekday, total = load_aggregates(since)
+if by_weekday["entries"].sum() == 0:
+    st.info("아직 모인 기록이 없습니다. 첫 번째 기록을 남겨 보세요! 🌷")
+else:
+    st.caption(f"지금까지 모인 익명 기록 {total:,}개 (1분마다 갱신)")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### 🕐 시간대별 감정 분포")
+        st.bar_chart(by_hour)
+    with col2:
+        st.markdown("##### 📅 요일별 평균 에너지")
+        # 차트가 x축을 글자순으로 정렬하지 않도록 요일 앞에 번호
+        energy_by_day = by_weekday["energy"].rename(index=lambda d: f"{WEEKDAYS.index(d) + 1}. {d}")
+        st.bar_chart(energy_by_day, color="#f783ac")
+
 st.markdown("""
 ---
 💡 하루 3번 기록만으로 충분합니다.  
@@ -0,0 +1,188 @@
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# 지명 사전 (오프라인 지오코딩)
+# -------------------------
+# 사고 데이터의 위치명/좌표(+ 선택적인 행정경계 GeoJSON)로 지명 사전을 만들고,
+# 정규화한 한글 키를 정렬된 배열에 넣고 이분 탐색으로 접두어 범위를 찾아 입력한 지명을 위경도로 바꿉니다.
+
+NAME_COLS = ["사고지역위치명", "사고다발지역시도시군구", "시군구", "지역명"]
+SIGUNGU_COLS = ["사고다발지역시도시군구", "시군구", "지역명"]
+BOUNDARY_NAME_KEYS = ["SIG_KOR_NM", "sig_kor_nm", "name", "NAME"]
+TOP_K = 5
+
+# 자주 쓰는 시도 약칭
+SIDO_ALIASES = {
+    "서울특별시": "서울", "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원도": "강원", "강원특별자치도": "강원", "충청북도": "충북",
+    "충청남도": "충남", "전라북도": "전북", "전북특별자치도": "전북", "전라남도": "전남",
+    "경상북도": "경북", "경상남도": "경남", "제주특별자치도": "제주",
+}
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+# 지역명 정리 규칙 (끝의 숫자 제거). 통계 보기의 region_clean, 추이, 지명 사전이 모두 이 규칙을 씁니다
+_TRAILING_DIGITS = r"\d+$"
+
+
+def clean_region(name):
+    return re.sub(_TRAILING_DIGITS, "", str(name)).strip()
+
+
+def clean_regions(series):
+    """clean_region의 Series 버전"""
+    return series.astype(str).str.replace(_TRAILING_DIGITS, "", regex=True).str.strip()
+
+
+def _clean_names(series):
+    # 빈 이름은 "nan" 문자열이 되지 않도록 그대로 비워 둡니다
+    names = series.where(series.notna() & (series.astype(str).str.strip() != ""))
+    return names.map(clean_region, na_action="ignore")
+
+
+def normalize_name(name):
+    """공백/기호를 없애고 NFC로 맞춘 검색 키"""
+    s = unicodedata.normalize("NFKC", str(name)).lower()
+    s = _NON_WORD.sub("", s)
+    s = re.sub(r"\d+$", "", s)
+    return unicodedata.normalize("NFC", s)
+
+
+def _token_keys(name):
+    # "서울특별시 강남구 역삼동" → 각 토큰에서 시작하는 키 + 시도 약칭 키
+    tokens = [t for t in re.split(r"[\s,()\[\]/·-]+", clean_region(name)) if t]
+    keys = []
+    for i in range(len(tokens)):
+        key = normalize_name("".join(tokens[i:]))
+        if key:
+            keys.append(key)
+    if tokens and tokens[0] in SIDO_ALIASES:
+        key = normalize_name(SIDO_ALIASES[tokens[0]] + "".join(tokens[1:]))
+        if key:
+            keys.append(key)
+    return keys
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    lat: float
+    lon: float
+    sigungu: str
+    weight: float = 0.0
+
+
+class Gazetteer:
+    def __init__(self, places):
+        # 가중치 내림차순으로 정렬해 두면 place 번호가 곧 순위
+        self.places = sorted(places, key=lambda p: -p.weight)
+        self.exact = {}
+        entries = set()
+        for i, place in enumerate(self.places):
+            for key in _token_keys(place.name):
+                self.exact.setdefault(key, i)
+                entries.add((key, i))
+        # 정렬된 키 배열: 접두어 검색은 이분 탐색 두 번으로 범위를 찾습니다
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.ids = np.fromiter((i for _, i in entries), dtype=np.int64, count=len(entries))
+
+    def _prefix_top(self, key, k):
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + "\uffff", lo)
+        if lo == hi:
+            return []
+        # 번호가 작을수록 가중치가 크므로 작은 번호 k개 (같은 지명의 여러 키는 하나로)
+        return np.unique(self.ids[lo:hi])[:k].tolist()
+
+    def suggest(self, query, k=TOP_K):
+        key = normalize_name(query)
+        if not key:
+            return []
+        ids = self._prefix_top(key, k)
+        hit = self.exact.get(key)
+        if hit is not None:
+            ids = [hit] + [i for i in ids if i != hit][:k - 1]
+        return [self.places[i] for i in ids]
+
+    def lookup(self, query):
+        hits = self.suggest(query, k=1)
+        return hits[0] if hits else None
+
+    def __len__(self):
+        return len(self.places)
+
+    # -------------------------
+    # 사전 만들기
+    # -------------------------
+    @classmethod
+    def from_frame(cls, df, boundary_path=None):
+        places = []
+        if {"위도", "경도"}.issubset(df.columns):
+            coords = df[["위도", "경도"]].apply(pd.to_numeric, errors="coerce")
+            weights = df["사고건수"].fillna(0) if "사고건수" in df.columns else None
+            sigungu_col = next((c for c in SIGUNGU_COLS if c in df.columns), None)
+            sigungu = _clean_names(df[sigungu_col]) if sigungu_col else None
+            for col in NAME_COLS:
+                if col not in df.columns:
+                    continue
+                frame = coords.assign(
+                    name=_clean_names(df[col]),
+                    weight=1 if weights is None else weights,
+                    sigungu="" if sigungu is None else sigungu,
+                ).dropna(subset=["위도", "경도", "name"])
+                frame = frame[frame["name"] != ""]
+                grouped = frame.groupby("name", sort=False).agg(
+                    lat=("위도", "mean"), lon=("경도", "mean"),
+                    weight=("weight", "sum"), sigungu=("sigungu", "first"),
+                )
+                # "first"는 빈 시군구를 건너뛰고, 전부 비었으면 NaN
+                for name, lat, lon, weight, sig in zip(grouped.index, grouped["lat"].to_numpy(dtype=float),
+                                                       grouped["lon"].to_numpy(dtype=float),
+                                                       grouped["weight"].to_numpy(dtype=float), grouped["sigungu"]):
+                    sig = sig if isinstance(sig, str) and sig else name
+                    places.append(Place(name, lat, lon, sig, weight))
+        if boundary_path and os.path.exists(boundary_path):
+            places.extend(load_boundaries(boundary_path))
+        return cls(places)
+
+
+# -------------------------
+# 행정경계 (선택)
+# -------------------------
+def _ring_center(geometry):
+    coords = geometry.get("coordinates") or []
+    if geometry.get("type") == "Polygon":
+        rings = [coords[0]] if coords else []
+    elif geometry.get("type") == "MultiPolygon":
+        rings = [poly[0] for poly in coords if poly]
+    else:
+        return None
+    points = [pt for ring in rings for pt in ring]
+    if not points:
+        return None
+    lon = sum(p[0] for p in points) / len(points)
+    lat = sum(p[1] for p in points) / len(points)
+    return lat, lon
+
+
+def load_boundaries(path):
+    with open(path, encoding="utf-8") as f:
+        geo = json.load(f)
+    places = []
+    for feature in geo.get("features", []):
+        props = feature.get("properties") or {}
+        name = next((props[k] for k in BOUNDARY_NAME_KEYS if props.get(k)), None)
+        center = _ring_center(feature.get("geometry") or {})
+        if name and center:
+            # 행정경계는 사고 위치보다 뒤로 가도록 가중치 0
+            places.append(Place(str(name), center[0], center[1], str(name), 0.0))
+    return places
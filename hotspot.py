@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# 사고다발 구역(핫스팟) 묶기
+# -------------------------
+# 격자로 가속한 DBSCAN 근사: eps 크기 격자에 점을 넣고, min_points 이상인 칸을
+# 핵심 칸으로 보고 이웃한 칸끼리 라벨 전파로 연결합니다. 전부 NumPy 연산입니다.
+
+SEVERITY_WEIGHTS = {"사망자수": 10, "중상자수": 3, "경상자수": 1, "사고건수": 0.5}
+# 지도 점 색상 구간 (sev_score 2 / 5 / 10 이상)
+SEVERITY_BANDS = [2, 5, 10]
+SEVERITY_PALETTE = [[255, 220, 220, 140], [255, 180, 180, 170], [255, 100, 100, 200], [255, 50, 50, 230]]
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON = 111.320
+NEIGHBORS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+
+
+def severity_scores(df):
+    # 지도 보기의 severity_score와 같은 가중치를 한 번에 계산
+    score = np.zeros(len(df), dtype=float)
+    for col, w in SEVERITY_WEIGHTS.items():
+        if col in df.columns:
+            score += w * pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+    return score
+
+
+def severity_bands(sev):
+    # 0(약함) ~ 3(심각) 구간 번호
+    return np.searchsorted(SEVERITY_BANDS, sev, side="right")
+
+
+def _cell_keys(lat, lon, eps_km):
+    lat0 = np.radians(np.nanmean(lat)) if len(lat) else 0.0
+    gx = np.floor(lon * KM_PER_DEG_LON * np.cos(lat0) / eps_km).astype(np.int64)
+    gy = np.floor(lat * KM_PER_DEG_LAT / eps_km).astype(np.int64)
+    gx -= gx.min() - 1
+    gy -= gy.min() - 1
+    width = int(gy.max()) + 2
+    return gx * width + gy, width
+
+
+def cluster_points(lat, lon, eps_km=0.5, min_points=3):
+    """각 점의 구역 라벨(-1은 잡음)"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    labels = np.full(len(lat), -1, dtype=np.int64)
+    if len(lat) == 0:
+        return labels
+
+    keys, width = _cell_keys(lat, lon, eps_km)
+    cells, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    dense = counts >= min_points
+
+    # 이웃 칸 인덱스 (없으면 -1)
+    neighbor_idx = []
+    for dx, dy in NEIGHBORS:
+        target = cells + dx * width + dy
+        pos = np.searchsorted(cells, target)
+        pos = np.clip(pos, 0, len(cells) - 1)
+        neighbor_idx.append(np.where(cells[pos] == target, pos, -1))
+    neighbor_idx = np.stack(neighbor_idx, axis=1)
+
+    # 핵심 칸끼리 최소 라벨 전파 (연결 요소)
+    cell_label = np.where(dense, np.arange(len(cells)), len(cells))
+    while True:
+        nb = np.where(neighbor_idx >= 0, cell_label[neighbor_idx], len(cells))
+        nb = np.where(dense[:, None], nb, len(cells))
+        updated = np.where(dense, np.minimum(cell_label, nb.min(axis=1)), cell_label)
+        if np.array_equal(updated, cell_label):
+            break
+        cell_label = updated
+
+    # 경계 칸: 이웃한 핵심 칸의 라벨을 따라감
+    border = ~dense
+    nb_core = np.where((neighbor_idx >= 0) & dense[np.clip(neighbor_idx, 0, None)],
+                       cell_label[np.clip(neighbor_idx, 0, None)], len(cells))
+    cell_label = np.where(border, nb_core.min(axis=1), cell_label)
+
+    point_label = cell_label[inverse]
+    keep = point_label < len(cells)
+    _, labels[keep] = np.unique(point_label[keep], return_inverse=True)
+    return labels
+
+
+def _hull(points):
+    # 단조 사슬 볼록 껍질 (구역 테두리 폴리곤)
+    pts = sorted(set(map(tuple, points)))
+    if len(pts) <= 2:
+        return [list(p) for p in pts]
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in pts:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(pts):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return [list(p) for p in lower[:-1] + upper[:-1]]
+
+
+def _box(lon, lat, pad):
+    return [[lon - pad, lat - pad], [lon + pad, lat - pad], [lon + pad, lat + pad], [lon - pad, lat + pad]]
+
+
+def rank_hotspots(df, eps_km=0.5, min_points=3, top_n=200):
+    """구역별 심각도 합계 순위표 (+ polygon 컬럼)"""
+    columns = ["순위", "위도", "경도", "지점수", "사고건수", "사망자수", "sev_score", "대표위치", "polygon"]
+    if not {"위도", "경도"}.issubset(df.columns) or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    lat = pd.to_numeric(df["위도"], errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(df["경도"], errors="coerce").to_numpy(dtype=float)
+    ok = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon = lat[ok], lon[ok]
+    sev = severity_scores(df)[ok]
+    labels = cluster_points(lat, lon, eps_km, min_points)
+    in_zone = labels >= 0
+    if not in_zone.any():
+        return pd.DataFrame(columns=columns)
+
+    lab = labels[in_zone]
+    n = int(lab.max()) + 1
+
+    def total(col):
+        if col not in df.columns:
+            return np.zeros(n)
+        values = pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)[ok][in_zone]
+        return np.bincount(lab, weights=values, minlength=n)
+
+    sev_in = sev[in_zone]
+    sev_sum = np.bincount(lab, weights=sev_in, minlength=n)
+    size = np.bincount(lab, minlength=n)
+    w = sev_in + 1e-9
+    wsum = np.bincount(lab, weights=w, minlength=n)
+    center_lat = np.bincount(lab, weights=lat[in_zone] * w, minlength=n) / wsum
+    center_lon = np.bincount(lab, weights=lon[in_zone] * w, minlength=n) / wsum
+
+    # 구역마다 가장 심각한 지점의 위치명을 대표 이름으로
+    names = df["사고지역위치명"].astype(str).to_numpy()[ok][in_zone] if "사고지역위치명" in df.columns else None
+    order = np.lexsort((-sev_in, lab))
+    first = order[np.r_[True, lab[order][1:] != lab[order][:-1]]]
+
+    table = pd.DataFrame({
+        "위도": center_lat, "경도": center_lon, "지점수": size,
+        "사고건수": total("사고건수").astype(int), "사망자수": total("사망자수").astype(int),
+        "sev_score": sev_sum,
+        "대표위치": names[first] if names is not None else "",
+    })
+    table = table.sort_values("sev_score", ascending=False).head(top_n)
+
+    # 상위 구역만 폴리곤 계산
+    pad = eps_km / KM_PER_DEG_LAT / 2
+    zlat, zlon = lat[in_zone], lon[in_zone]
+    member_order = np.argsort(lab, kind="stable")
+    bounds = np.searchsorted(lab[member_order], np.arange(n + 1))
+    polygons = []
+    for zone in table.index:
+        members = member_order[bounds[zone]:bounds[zone + 1]]
+        pts = np.column_stack([zlon[members], zlat[members]])
+        hull = _hull(np.round(pts, 6).tolist())
+        polygons.append(hull if len(hull) >= 3 else _box(table.at[zone, "경도"], table.at[zone, "위도"], pad))
+    table["polygon"] = polygons
+    table.insert(0, "순위", np.arange(1, len(table) + 1))
+    return table.reset_index(drop=True)[columns]
@@ -0,0 +1,220 @@
+"""carcrash.py 동시 세션 부하 테스트
+
+예) python loadtest.py --sessions 20 --workers 4 --rows 50000
+
+streamlit.testing.v1.AppTest로 앱을 브라우저 없이 실행합니다. 데이터 소스는
+합성 CSV(CARCRASH_DATA_URL)로 바꾸고, 세션마다 연도 범위·사고유형·줌·메뉴를
+바꾸는 시나리오를 돌려 rerun 지연(p50/p95/p99), 처리량, 프로세스별 메모리를 보고합니다.
+
+워커 프로세스 하나가 서버 프로세스 하나에 해당합니다. 같은 프로세스에 배정된 세션들은
+실제 서버처럼 스레드에서 동시에 돌아 캐시/GIL을 같이 씁니다. 첫 실행(콜드)과 이후
+rerun(웜) 지연은 따로 집계합니다.
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "carcrash.py")
+PAGES = ["carcrash_pages/map_view.py", "carcrash_pages/stats_view.py", "carcrash_pages/participate.py"]
+TYPES = ["보행자", "자전거", "이륜차", "화물차", "노인", "어린이", "음주운전", "야간"]
+REGIONS = ["서울특별시 강남구", "서울특별시 종로구", "부산광역시 해운대구", "대구광역시 중구",
+           "인천광역시 남동구", "광주광역시 북구", "대전광역시 서구", "경기도 수원시", "강원도 춘천시",
+           "충청북도 청주시", "전라남도 여수시", "경상남도 창원시", "제주특별자치도 제주시"]
+
+
+# -------------------------
+# 합성 데이터
+# -------------------------
+def make_synthetic_csv(path, rows=20000, years=(2012, 2023), seed=0):
+    rng = np.random.default_rng(seed)
+    region = rng.integers(0, len(REGIONS), rows)
+    centers = rng.uniform([34.5, 126.5], [37.8, 129.2], size=(len(REGIONS), 2))
+    df = pd.DataFrame({
+        "사고연도": rng.integers(years[0], years[1] + 1, rows),
+        "사고유형구분": rng.choice(TYPES, rows),
+        "사고다발지역시도시군구": [f"{REGIONS[r]}{rng.integers(1, 30)}" for r in region],
+        "사고지역위치명": [f"{REGIONS[r]} 지점{rng.integers(1, 500)}" for r in region],
+        "사고건수": rng.integers(1, 15, rows),
+        "사망자수": rng.poisson(0.1, rows),
+        "중상자수": rng.poisson(1.0, rows),
+        "경상자수": rng.poisson(2.0, rows),
+        "위도": centers[region, 0] + rng.normal(0, 0.05, rows),
+        "경도": centers[region, 1] + rng.normal(0, 0.05, rows),
+    })
+    df["사상자수"] = df["사망자수"] + df["중상자수"] + df["경상자수"]
+    df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+# -------------------------
+# 세션 시나리오
+# -------------------------
+def _widget(group, label):
+    return next(w for w in group if w.label == label)
+
+
+def _timed_run(at, timings, timeout):
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    timings.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def run_session(session_id, steps, timeout, start_barrier=None):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    timings = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    if start_barrier is not None:
+        start_barrier.wait(timeout)  # 같은 프로세스의 세션들이 빈 캐시에서 동시에 시작
+    _timed_run(at, timings, timeout)
+
+    for _ in range(steps):
+        action = rng.choice(["menu", "years", "types", "zoom"])
+        if action == "menu":
+            at.switch_page(rng.choice(PAGES))
+            _timed_run(at, timings, timeout)
+            continue
+
+        # 필터는 지도/통계 페이지에, 줌은 지도 페이지에만 있으므로 없으면 지도 보기로 먼저 이동
+        zoom = [w for w in at.slider if w.label.startswith("지도 확대 수준")]
+        # 사이드바에는 글자 크기 슬라이더가 항상 있으므로 필터 위젯은 이름으로 찾습니다
+        has_filters = any(w.label == "연도 범위 선택" for w in at.sidebar.slider)
+        if not zoom and (action == "zoom" or not has_filters):
+            at.switch_page(PAGES[0])
+            _timed_run(at, timings, timeout)
+            zoom = [w for w in at.slider if w.label.startswith("지도 확대 수준")]
+
+        if action == "years":
+            slider = _widget(at.sidebar.slider, "연도 범위 선택")
+            lo, hi = slider.min, slider.max
+            a = rng.randint(lo, hi)
+            slider.set_value((a, rng.randint(a, hi)))
+        elif action == "types":
+            box = _widget(at.sidebar.multiselect, "사고유형 필터")
+            box.set_value(rng.sample(box.options, rng.randint(1, len(box.options))))
+        else:
+            zoom[0].set_value(rng.randint(4, 12))
+        _timed_run(at, timings, timeout)
+
+    return {"session": session_id, "cold": timings[0], "timings": timings[1:]}
+
+
+def run_server(session_ids, data_path, steps, timeout):
+    """서버 프로세스 하나: 배정된 세션들을 스레드에서 동시에 실행"""
+    # 운영용 접근 기록/추가 CSV 폴더를 건드리지 않도록 프로세스마다 임시 폴더를 씁니다
+    work_dir = tempfile.mkdtemp(prefix="carcrash-loadtest-")
+    os.environ["CARCRASH_DATA_URL"] = data_path
+    os.environ["CARCRASH_ACCESS_LOG"] = os.path.join(work_dir, "access.json")
+    os.environ["CARCRASH_DROP_DIR"] = os.path.join(work_dir, "drops")
+    os.environ["CARCRASH_REFRESH_SECONDS"] = "0"
+    os.environ.pop("CARCRASH_ARROW_PATH", None)
+    sys.path.insert(0, os.path.dirname(APP_PATH))  # 앱 옆의 gazetteer/hotspot 등 모듈
+
+    results, errors = [], []
+    barrier = threading.Barrier(len(session_ids))
+    try:
+        with ThreadPoolExecutor(max_workers=len(session_ids), thread_name_prefix="session") as pool:
+            futures = {pool.submit(run_session, i, steps, timeout, barrier): i for i in session_ids}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors.append(f"세션 {futures[future]}: {e!r}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # ru_maxrss: 리눅스는 KB, macOS는 바이트
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+    return {"pid": os.getpid(), "results": results, "errors": errors, "max_rss_mb": rss_mb}
+
+
+# -------------------------
+# 실행 / 보고
+# -------------------------
+def _percentiles(values, prefix):
+    values = np.asarray(values, dtype=float) * 1000
+    return {f"{prefix}_p{q}_ms": float(np.percentile(values, q)) if values.size else float("nan")
+            for q in (50, 95, 99)}
+
+
+def run_load_test(sessions, workers, steps, data_path, timeout=120):
+    results, errors, memory = [], [], {}
+    # 세션을 서버 프로세스에 고르게 나눔 (프로세스 안에서는 동시 실행)
+    groups = [list(range(sessions))[w::workers] for w in range(workers)]
+    groups = [g for g in groups if g]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+        futures = [pool.submit(run_server, g, data_path, steps, timeout) for g in groups]
+        for future in as_completed(futures):
+            try:
+                server = future.result()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            results += server["results"]
+            errors += server["errors"]
+            memory[server["pid"]] = server["max_rss_mb"]
+    elapsed = time.perf_counter() - start
+
+    cold = [r["cold"] for r in results]
+    warm = [t for r in results for t in r["timings"]]
+    reruns = len(cold) + len(warm)
+    return {
+        "sessions": len(results),
+        "servers": len(groups),
+        "errors": errors,
+        "reruns": reruns,
+        "elapsed_s": elapsed,
+        "throughput_rps": reruns / elapsed if elapsed else 0.0,
+        **_percentiles(cold, "cold"),
+        **_percentiles(warm, "warm"),
+        "memory_mb": memory,
+    }
+
+
+def print_report(report):
+    print(f"서버 프로세스 {report['servers']}개 · 세션 {report['sessions']}개 · "
+          f"rerun {report['reruns']}회 · {report['elapsed_s']:.1f}s")
+    print(f"처리량  {report['throughput_rps']:.2f} rerun/s")
+    for kind, label in (("cold", "콜드"), ("warm", "웜")):
+        print(f"{label} 지연  p50 {report[f'{kind}_p50_ms']:.0f}ms · p95 {report[f'{kind}_p95_ms']:.0f}ms"
+              f" · p99 {report[f'{kind}_p99_ms']:.0f}ms")
+    for pid, mb in sorted(report["memory_mb"].items()):
+        print(f"메모리  pid {pid}: 최대 {mb:.0f}MB")
+    for err in report["errors"]:
+        print(f"오류    {err}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="carcrash.py 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--workers", type=int, default=2, help="서버 프로세스 수 (세션은 프로세스 안에서 스레드로 동시 실행)")
+    parser.add_argument("--steps", type=int, default=10, help="세션당 상호작용 횟수")
+    parser.add_argument("--rows", type=int, default=20000, help="합성 데이터 행 수")
+    parser.add_argument("--data", help="사용할 CSV 경로 (없으면 합성 데이터 생성)")
+    parser.add_argument("--timeout", type=float, default=120, help="rerun 한 번의 제한 시간(초)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = args.data or make_synthetic_csv(os.path.join(tmp, "synthetic.csv"), rows=args.rows)
+        report = run_load_test(args.sessions, args.workers, args.steps, data_path, args.timeout)
+    print_report(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
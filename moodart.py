@@ -0,0 +1,73 @@
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# 감정 기록 → 그라데이션 그림 (PNG)
+# -------------------------
+# 가로축은 기록 시각, 색은 감정 색(color_map), 세로로 차오르는 높이와 진하기는 에너지입니다.
+# 기록 사이 색과 에너지는 선형 보간하고, 전체 그림을 한 번의 NumPy 연산으로 칠합니다.
+
+BACKGROUND = (255, 245, 250)
+ART_SIZE = (1200, 320)  # (가로, 세로) 픽셀
+FADE = 0.18  # 에너지 높이 위로 번지는 정도 (세로 비율)
+
+
+def hex_to_rgb(colors):
+    """'#ff99cc' 목록 → (N, 3) float 배열 (고유 색만 한 번씩 변환)"""
+    colors = pd.Series(colors, dtype=str).str.lstrip("#")
+    codes, uniques = pd.factorize(colors)
+    table = np.array([[int(c[i:i + 2], 16) for i in (0, 2, 4)] for c in uniques], dtype=float)
+    return table[codes]
+
+
+def render_mood_art(times, energies, colors, size=ART_SIZE, background=BACKGROUND):
+    """기록 전체를 (세로, 가로, 3) uint8 그림으로"""
+    width, height = size
+    t = pd.to_datetime(pd.Series(times), errors="coerce")
+    ok = t.notna().to_numpy()
+    t = t[ok].astype("int64").to_numpy() / 1e9
+    energy = np.clip(pd.to_numeric(pd.Series(energies), errors="coerce").fillna(0).to_numpy()[ok], 0, 10) / 10
+    rgb = hex_to_rgb(np.asarray(colors)[ok])
+    bg = np.array(background, dtype=float)
+    if len(t) == 0:
+        return np.broadcast_to(bg.astype(np.uint8), (height, width, 3)).copy()
+
+    order = np.argsort(t, kind="stable")
+    t, energy, rgb = t[order], energy[order], rgb[order]
+
+    # 각 기록의 가로 위치 (기록이 하나면 전체를 같은 색으로)
+    span = t[-1] - t[0]
+    xp = (t - t[0]) / span * (width - 1) if span > 0 else np.zeros(len(t))
+    x = np.arange(width)
+    col_energy = np.interp(x, xp, energy)
+    col_rgb = np.stack([np.interp(x, xp, rgb[:, c]) for c in range(3)], axis=1)
+
+    # 아래에서부터 에너지 높이까지 차오르고 위로는 부드럽게 옅어지는 세기 (세로, 가로)
+    level = 1 - (np.arange(height) + 0.5) / height
+    intensity = np.clip(1 - (level[:, None] - col_energy[None, :]) / FADE, 0, 1)
+    intensity *= 0.45 + 0.55 * col_energy[None, :]
+
+    image = bg + (col_rgb[None, :, :] - bg) * intensity[..., None]
+    return np.round(image).astype(np.uint8)
+
+
+def encode_png(image):
+    """(세로, 가로, 3) uint8 → PNG 바이트 (zlib만 사용)"""
+    height, width, _ = image.shape
+    # 각 줄 앞에 필터 번호 0(없음)
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+def mood_art_png(df, size=ART_SIZE):
+    """feeling.py 기록 프레임(time, energy, color) → PNG 바이트"""
+    return encode_png(render_mood_art(df["time"], df["energy"], df["color"], size=size))
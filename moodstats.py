@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+# -------------------------
+# 전체 사용자 감정 통계 (익명 집계)
+# -------------------------
+# 기록 원본은 저장하지 않고, 기록할 때마다 시간별/일별 집계 테이블의 해당 칸만
+# 1 늘립니다. 통계 화면은 집계 테이블만 읽으므로 기록이 수백만 건이 되어도
+# 읽는 행 수는 (날짜 × 시간 × 감정) 칸 수에 머뭅니다.
+
+MOOD_DB_PATH = os.environ.get("FEELING_DB_PATH", "data/feeling_rollups.sqlite")
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mood_hourly (
+    day TEXT NOT NULL, hour INTEGER NOT NULL, mood TEXT NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0, energy_sum INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, hour, mood)
+);
+CREATE TABLE IF NOT EXISTS mood_daily (
+    day TEXT NOT NULL, weekday INTEGER NOT NULL, mood TEXT NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0, energy_sum INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, mood)
+);
+"""
+
+UPSERT_HOURLY = """
+INSERT INTO mood_hourly (day, hour, mood, entries, energy_sum) VALUES (?, ?, ?, 1, ?)
+ON CONFLICT (day, hour, mood) DO UPDATE SET entries = entries + 1, energy_sum = energy_sum + excluded.energy_sum
+"""
+UPSERT_DAILY = """
+INSERT INTO mood_daily (day, weekday, mood, entries, energy_sum) VALUES (?, ?, ?, 1, ?)
+ON CONFLICT (day, mood) DO UPDATE SET entries = entries + 1, energy_sum = energy_sum + excluded.energy_sum
+"""
+
+
+class MoodRollups:
+    def __init__(self, path=MOOD_DB_PATH):
+        self.path = path
+        self.local = threading.local()  # sqlite 연결은 스레드마다 따로
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")  # 기록 중에도 통계 읽기가 막히지 않도록
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self.local.conn = conn
+        return conn
+
+    def record(self, time, mood, energy):
+        """기록 한 건을 시간별/일별 집계에 반영 (한 트랜잭션)"""
+        when = datetime.strptime(time, "%Y-%m-%d %H:%M:%S") if isinstance(time, str) else time
+        day = when.strftime("%Y-%m-%d")
+        with self._conn() as conn:
+            conn.execute(UPSERT_HOURLY, (day, when.hour, mood, int(energy)))
+            conn.execute(UPSERT_DAILY, (day, when.weekday(), mood, int(energy)))
+
+    def _query(self, sql, params=()):
+        return pd.read_sql_query(sql, self._conn(), params=params)
+
+    def mood_by_hour(self, since=None):
+        """시간대(0~23) × 감정별 기록 수"""
+        df = self._query(
+            "SELECT hour, mood, SUM(entries) AS entries FROM mood_hourly"
+            + (" WHERE day >= ?" if since else "") + " GROUP BY hour, mood",
+            (since,) if since else (),
+        )
+        table = df.pivot(index="hour", columns="mood", values="entries")
+        return table.reindex(range(24)).fillna(0).astype(int)
+
+    def energy_by_weekday(self, since=None):
+        """요일별 평균 에너지와 기록 수"""
+        df = self._query(
+            "SELECT weekday, SUM(energy_sum) * 1.0 / SUM(entries) AS energy, SUM(entries) AS entries"
+            " FROM mood_daily" + (" WHERE day >= ?" if since else "") + " GROUP BY weekday",
+            (since,) if since else (),
+        )
+        df = df.set_index("weekday").reindex(range(7))
+        df.index = WEEKDAYS
+        df.index.name = "요일"
+        return df.fillna({"entries": 0}).astype({"entries": int})
+
+    def total(self):
+        return int(self._conn().execute("SELECT COALESCE(SUM(entries), 0) FROM mood_daily").fetchone()[0])
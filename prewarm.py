@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# -------------------------
+# 백그라운드 미리 만들기 (prewarm)
+# -------------------------
+# 통계 그림(figure JSON)과 지도 payload를 (종류, 파라미터) 키로 LRU 캐시에 담습니다.
+# 데이터 로드 직후 스레드 풀이 자주 요청된 조합부터 미리 만들어 두어,
+# 처음 보는 사용자도 groupby/직렬화 비용을 치르지 않게 합니다.
+
+ACCESS_LOG_PATH = os.environ.get(
+    "CARCRASH_ACCESS_LOG", os.path.join(tempfile.gettempdir(), "carcrash_access.json")
+)
+MEMORY_BUDGET = 256 * 1024 * 1024  # 바이트
+MISSING = object()  # 캐시에 없음 (None은 "빈 결과"로 캐시할 수 있는 값)
+
+
+class PayloadCache:
+    """크기 예산이 있는 스레드 안전 LRU"""
+
+    def __init__(self, budget=MEMORY_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.items.move_to_end(key)
+            return self.items[key][0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            if key in self.items:
+                self.used -= self.items.pop(key)[1]
+            if size > self.budget:
+                return
+            self.items[key] = (value, size)
+            self.used += size
+            while self.used > self.budget:
+                _, (_, old_size) = self.items.popitem(last=False)
+                self.used -= old_size
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.items
+
+
+class AccessLog:
+    """키별 요청 횟수 (재시작 후에도 순서를 쓰도록 파일에 저장)"""
+
+    def __init__(self, path=ACCESS_LOG_PATH, flush_every=20):
+        self.path = path
+        self.flush_every = flush_every
+        self.counts = Counter()
+        self.pending = 0
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for key, n in json.load(f):
+                        self.counts[_freeze_key(key)] = n
+            except (OSError, ValueError, TypeError):
+                pass
+
+    def record(self, key):
+        with self.lock:
+            self.counts[key] += 1
+            self.pending += 1
+            if self.pending >= self.flush_every:
+                self._flush()
+
+    def most_common(self, n=None):
+        with self.lock:
+            return [key for key, _ in self.counts.most_common(n)]
+
+    def _flush(self):
+        self.pending = 0
+        if not self.path:
+            return
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump([[key, n] for key, n in self.counts.items()], f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def _freeze_key(key):
+    # JSON에서 읽은 리스트를 다시 해시 가능한 튜플로
+    if isinstance(key, list):
+        return tuple(_freeze_key(k) for k in key)
+    return key
+
+
+class Prewarmer:
+    def __init__(self, builders, budget=MEMORY_BUDGET, workers=2, access_log=None):
+        """builders: {종류: (params → (값, 바이트 크기))}"""
+        self.builders = builders
+        self.cache = PayloadCache(budget)
+        self.access = access_log or AccessLog()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prewarm")
+        self.inflight = {}
+        self.lock = threading.Lock()
+
+    def _build(self, key):
+        kind, params = key[0], key[1:]
+        value, size = self.builders[kind](*params)
+        self.cache.put(key, value, size)
+        return value
+
+    def _submit(self, key, inline=False):
+        """같은 키는 한 번만 만듭니다. inline이면 풀 대기열 대신 호출한 스레드에서 바로 만듦"""
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                return future
+            value = self.cache.get(key, MISSING)  # 방금 끝난 빌드
+            if value is not MISSING:
+                future = Future()
+                future.set_result(value)
+                return future
+            if inline:
+                future = Future()
+                future.set_running_or_notify_cancel()
+            else:
+                future = self.pool.submit(self._build, key)
+            self.inflight[key] = future
+        # 이미 끝난 future면 콜백이 바로 불리므로 lock 밖에서 등록
+        future.add_done_callback(lambda _, key=key: self._done(key))
+        if inline:
+            try:
+                future.set_result(self._build(key))
+            except BaseException as e:
+                future.set_exception(e)
+        return future
+
+    def _done(self, key):
+        with self.lock:
+            self.inflight.pop(key, None)
+
+    def get(self, kind, *params):
+        key = (kind, *params)
+        self.access.record(key)
+        value = self.cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        # 만드는 중이면 그 결과를 기다리고, 아니면 이 스레드에서 만듭니다 (동시 요청은 한 번만 빌드)
+        return self._submit(key, inline=True).result()
+
+    def warm(self, defaults=(), limit=100):
+        """요청 횟수가 많은 조합부터, 그다음 기본 조합 순서로 미리 만들기"""
+        seen = set()
+        for key in self.access.most_common() + list(defaults):
+            if len(seen) >= limit:
+                break
+            if key in seen or key[0] not in self.builders or key in self.cache:
+                continue
+            seen.add(key)
+            self._submit(key)
@@ -0,0 +1,67 @@
+import importlib
+import json
+import os
+import sys
+import time
+
+import streamlit as st
+
+# -------------------------
+# 시작 시간 프로파일
+# -------------------------
+# CARCRASH_PROFILE=1 이거나 주소에 ?profile=1 을 붙이면 사이드바에 이번 rerun의
+# 구간별 시간(첫 화면 표시까지 포함)과 무거운 모듈의 최초 import 시간을 보여 줍니다.
+# CARCRASH_PROFILE_LOG를 지정하면 한 줄에 하나씩 JSON으로 남겨 페이지별 추이를 볼 수 있습니다.
+
+PROFILE_LOG = os.environ.get("CARCRASH_PROFILE_LOG")
+
+_import_times = {}  # 모듈 → 이 프로세스에서 처음 import할 때 걸린 초
+
+
+def enabled():
+    return os.environ.get("CARCRASH_PROFILE") == "1" or st.query_params.get("profile") == "1"
+
+
+def timed_import(name):
+    """무거운 모듈은 필요한 페이지에서 이 함수로 불러와 import 시간을 기록"""
+    # sys.modules에 이름이 먼저 올라간 뒤 초기화가 끝나므로, 다른 세션이 import 중이면
+    # import_module이 그 모듈의 import lock에서 기다리게 두어야 합니다
+    first = name not in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if first:
+        _import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def start(started=None):
+    st.session_state["_profile"] = {"start": started or time.perf_counter(), "marks": []}
+
+
+def mark(label):
+    profile = st.session_state.get("_profile")
+    if profile is not None:
+        profile["marks"].append((label, time.perf_counter() - profile["start"]))
+
+
+def report(page):
+    profile = st.session_state.get("_profile")
+    if profile is None or not enabled():
+        return
+    total = time.perf_counter() - profile["start"]
+    with st.sidebar.expander("⏱️ 시작 시간 프로파일", expanded=True):
+        st.caption(f"**{page}** · rerun 전체 {total * 1000:.0f}ms")
+        for label, sec in profile["marks"]:
+            st.caption(f"· {label}: {sec * 1000:.0f}ms")
+        for name, sec in sorted(_import_times.items(), key=lambda item: -item[1]):
+            st.caption(f"· import {name} (최초): {sec * 1000:.0f}ms")
+
+    if PROFILE_LOG:
+        record = {"time": time.time(), "page": page, "total_ms": total * 1000,
+                  "marks": {label: sec * 1000 for label, sec in profile["marks"]},
+                  "imports": {name: sec * 1000 for name, sec in _import_times.items()}}
+        try:
+            with open(PROFILE_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
@@ -0,0 +1,306 @@
+import hashlib
+import math
+import os
+import re
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from basemap import style_json
+from hotspot import severity_bands
+from prewarm import PayloadCache
+
+# -------------------------
+# 로컬 벡터 타일(MVT) 서버
+# -------------------------
+# /tiles/{z}/{x}/{y}.pbf 로 사고 지점·격자 집계·사고다발 구역 중심을 Mapbox Vector Tile로
+# 보냅니다. 브라우저(pydeck MVTLayer)는 화면에 보이는 타일만 받아 가므로 지도를 자유롭게
+# 이동/확대할 수 있습니다. 타일은 ETag + 메모리 LRU로 캐시합니다.
+# 오프라인 배경지도(basemap.py의 MBTiles)도 /basemap/{스타일}/{z}/{x}/{y},
+# /styles/{스타일}.json 으로 함께 내보냅니다.
+
+TILE_PORT = int(os.environ.get("CARCRASH_TILE_PORT", "8765"))
+TILE_URL = os.environ.get("CARCRASH_TILE_URL", f"http://localhost:{TILE_PORT}")
+EXTENT = 4096
+DETAIL_ZOOM = 10     # 이 줌부터는 개별 지점, 그 전에는 격자 집계
+GRID_CELLS = 64      # 집계 타일 한 변의 격자 수
+MAX_FEATURES = 20000
+TILE_BUDGET = 128 * 1024 * 1024
+
+_TILE_PATH = re.compile(r"^/tiles/(\d+)/(\d+)/(\d+)\.(?:pbf|mvt)$")
+_BASEMAP_PATH = re.compile(r"^/basemap/(\w+)/(\d+)/(\d+)/(\d+)(?:\.\w+)?$")
+_STYLE_PATH = re.compile(r"^/styles/(\w+)\.json$")
+
+
+# -------------------------
+# protobuf 인코딩 (MVT 2.1에 필요한 만큼만)
+# -------------------------
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _field(number, wire, payload):
+    key = _varint((number << 3) | wire)
+    if wire == 2:
+        return key + _varint(len(payload)) + payload
+    return key + payload
+
+
+def _packed(number, values):
+    return _field(number, 2, b"".join(_varint(v) for v in values))
+
+
+def _value(v):
+    if isinstance(v, str):
+        return _field(1, 2, v.encode("utf-8"))
+    if isinstance(v, float):
+        return _field(3, 1, struct.pack("<d", v))
+    return _field(6, 0, _varint(_zigzag(int(v)) & 0xFFFFFFFFFFFFFFFF))
+
+
+def encode_layer(name, xs, ys, properties):
+    """점 레이어 하나 (xs, ys는 타일 안 정수 좌표, properties는 {키: 배열})"""
+    keys = list(properties)
+    values, value_index = [], {}
+    columns = [properties[k].tolist() if hasattr(properties[k], "tolist") else list(properties[k]) for k in keys]
+    features = []
+    for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+        tags = []
+        for k, col in enumerate(columns):
+            v = col[i]
+            if v is None or (isinstance(v, float) and math.isnan(v)):
+                continue
+            key = (type(v).__name__, v)
+            if key not in value_index:
+                value_index[key] = len(values)
+                values.append(_value(v))
+            tags += [k, value_index[key]]
+        geometry = [9, _zigzag(x), _zigzag(y)]  # MoveTo(1) + 좌표
+        feature = _field(1, 0, _varint(i + 1)) + _packed(2, tags) + _field(3, 0, _varint(1)) + _packed(4, geometry)
+        features.append(_field(2, 2, feature))
+    layer = (
+        _field(15, 0, _varint(2))
+        + _field(1, 2, name.encode("utf-8"))
+        + b"".join(features)
+        + b"".join(_field(3, 2, k.encode("utf-8")) for k in keys)
+        + b"".join(_field(4, 2, v) for v in values)
+        + _field(5, 0, _varint(EXTENT))
+    )
+    return _field(3, 2, layer)
+
+
+# -------------------------
+# 타일 인덱스
+# -------------------------
+def mercator(lon, lat):
+    lat = np.clip(lat, -85.0511, 85.0511)
+    mx = (np.asarray(lon, dtype=float) + 180.0) / 360.0
+    my = (1.0 - np.log(np.tan(np.radians(lat)) + 1.0 / np.cos(np.radians(lat))) / math.pi) / 2.0
+    return mx, my
+
+
+class PointTiles:
+    """점 데이터를 메르카토르 x로 정렬해 두고 타일 범위를 이분 탐색으로 자르기"""
+
+    def __init__(self, lon, lat, sev, properties=None, clusters=None):
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        ok = ~(np.isnan(lon) | np.isnan(lat))
+        mx, my = mercator(lon[ok], lat[ok])
+        order = np.argsort(mx, kind="stable")
+        self.mx, self.my = mx[order], my[order]
+        self.sev = np.asarray(sev, dtype=float)[ok][order]
+        self.band = severity_bands(self.sev).astype(np.int64)
+        self.properties = {k: np.asarray(v)[ok][order] for k, v in (properties or {}).items()}
+        self.clusters = None
+        if clusters is not None and len(clusters):
+            cx, cy = mercator(clusters["경도"].to_numpy(dtype=float), clusters["위도"].to_numpy(dtype=float))
+            self.clusters = (cx, cy, clusters)
+
+    def _in_tile(self, z, x, y):
+        n = 1 << z
+        lo, hi = np.searchsorted(self.mx, [x / n, (x + 1) / n])
+        idx = np.arange(lo, hi)
+        my = self.my[lo:hi]
+        idx = idx[(my >= y / n) & (my < (y + 1) / n)]
+        px = ((self.mx[idx] * n - x) * EXTENT).astype(np.int64)
+        py = ((self.my[idx] * n - y) * EXTENT).astype(np.int64)
+        return idx, px, py
+
+    def tile(self, z, x, y):
+        idx, px, py = self._in_tile(z, x, y)
+        out = b""
+        if z >= DETAIL_ZOOM:
+            if len(idx) > MAX_FEATURES:
+                top = np.argsort(-self.sev[idx], kind="stable")[:MAX_FEATURES]
+                idx, px, py = idx[top], px[top], py[top]
+            props = {"sev": np.round(self.sev[idx], 2), "band": self.band[idx]}
+            props.update({k: v[idx] for k, v in self.properties.items()})
+            out += encode_layer("accidents", px, py, props)
+        elif len(idx):
+            # 격자 칸별 합계, 좌표는 심각도 가중 중심
+            size = EXTENT // GRID_CELLS
+            cell = (py // size) * GRID_CELLS + (px // size)
+            cells, inverse = np.unique(cell, return_inverse=True)
+            w = self.sev[idx] + 1e-9
+            wsum = np.bincount(inverse, weights=w)
+            sev_sum = np.bincount(inverse, weights=self.sev[idx])
+            band_max = np.zeros(len(cells), dtype=np.int64)
+            np.maximum.at(band_max, inverse, self.band[idx])
+            props = {
+                "count": np.bincount(inverse).astype(np.int64),
+                "sev": np.round(sev_sum, 2),
+                "band": band_max,
+            }
+            if "사고건수" in self.properties:
+                props["사고건수"] = np.bincount(
+                    inverse, weights=self.properties["사고건수"][idx].astype(float)).astype(np.int64)
+            cx = (np.bincount(inverse, weights=px * w) / wsum).astype(np.int64)
+            cy = (np.bincount(inverse, weights=py * w) / wsum).astype(np.int64)
+            out += encode_layer("grid", cx, cy, props)
+
+        if self.clusters is not None:
+            cx, cy, table = self.clusters
+            n = 1 << z
+            inside = (cx >= x / n) & (cx < (x + 1) / n) & (cy >= y / n) & (cy < (y + 1) / n)
+            if inside.any():
+                sub = table[inside]
+                props = {
+                    "rank": sub["순위"].to_numpy(dtype=np.int64),
+                    "sev": np.round(sub["sev_score"].to_numpy(dtype=float), 2),
+                    "사고건수": sub["사고건수"].to_numpy(dtype=np.int64),
+                    "대표위치": sub["대표위치"].astype(str).to_numpy(),
+                }
+                px = ((cx[inside] * n - x) * EXTENT).astype(np.int64)
+                py = ((cy[inside] * n - y) * EXTENT).astype(np.int64)
+                out += encode_layer("hotspots", px, py, props)
+        return out
+
+
+# -------------------------
+# HTTP 서버
+# -------------------------
+class TileServer:
+    """source(query) → (etag_base, PointTiles), basemaps: {스타일 이름: MBTiles}, url: 브라우저가 접속할 주소"""
+
+    def __init__(self, source=None, port=TILE_PORT, host="0.0.0.0", basemaps=None, url=None):
+        self.source = source
+        self.basemaps = basemaps or {}
+        self.url = url or (TILE_URL if port == TILE_PORT else f"http://localhost:{port}")
+        self.cache = PayloadCache(TILE_BUDGET)
+        handler = type("Handler", (_TileHandler,), {"server_ref": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def get_tile(self, z, x, y, query, if_none_match=None):
+        if self.source is None:
+            raise KeyError("tiles")
+        etag_base, tiles = self.source(query)
+        etag = '"' + hashlib.sha1(f"{etag_base}/{z}/{x}/{y}".encode()).hexdigest()[:20] + '"'
+        if if_none_match == etag:
+            return etag, None
+        body = self.cache.get(etag)
+        if body is None:
+            body = tiles.tile(z, x, y)
+            self.cache.put(etag, body, len(body) + 100)
+        return etag, body
+
+    def get_basemap_tile(self, name, z, x, y, if_none_match=None):
+        basemap = self.basemaps[name]
+        etag = '"' + hashlib.sha1(f"{basemap.path}/{os.path.getmtime(basemap.path)}/{z}/{x}/{y}".encode()).hexdigest()[:20] + '"'
+        if if_none_match == etag:
+            return etag, None
+        return etag, basemap.tile(z, x, y) or b""
+
+
+class _TileHandler(BaseHTTPRequestHandler):
+    server_ref = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        inm = self.headers.get("If-None-Match")
+        m = _TILE_PATH.match(url.path)
+        b = _BASEMAP_PATH.match(url.path)
+        style = _STYLE_PATH.match(url.path)
+        try:
+            if m:
+                z, x, y = (int(g) for g in m.groups())
+                self._check_tile(z, x, y)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                etag, body = self.server_ref.get_tile(z, x, y, query, inm)
+                self._send(etag, body, "application/vnd.mapbox-vector-tile")
+            elif b:
+                name = b.group(1)
+                z, x, y = (int(g) for g in b.groups()[1:])
+                self._check_tile(z, x, y)
+                etag, body = self.server_ref.get_basemap_tile(name, z, x, y, inm)
+                self._send(etag, body, self.server_ref.basemaps[name].content_type)
+            elif style and style.group(1) in self.server_ref.basemaps:
+                name = style.group(1)
+                body = style_json(name, self.server_ref.basemaps[name], self.server_ref.url).encode("utf-8")
+                self._send(None, body, "application/json")
+            else:
+                self.send_error(404)
+        except IndexError:
+            self.send_error(404)
+        except (KeyError, ValueError):
+            self.send_error(400)
+
+    def _check_tile(self, z, x, y):
+        if not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+            raise IndexError(z)
+
+    def _send(self, etag, body, content_type):
+        if body is None:
+            status = 304
+        elif body == b"":
+            status = 204  # 빈 타일
+        else:
+            status = 200
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=300")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if body:
+            self.send_header("Content-Type", content_type)
+            if body[:2] == b"\x1f\x8b":
+                self.send_header("Content-Encoding", "gzip")  # MBTiles 벡터 타일은 보통 gzip 상태
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# -------------------------
+# pydeck 연결
+# -------------------------
+def band_color_expression(palette, accessor="properties.band"):
+    # 구간 번호 → 색상 (deck.gl 표현식)
+    expr = str(palette[0])
+    for band in range(1, len(palette)):
+        expr = f"{accessor} == {band} ? {palette[band]} : {expr}"
+    return "@@=" + expr
@@ -0,0 +1,117 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from gazetteer import clean_regions
+
+# -------------------------
+# 지역별 전년 대비 추이 / 이상치
+# -------------------------
+# 원본 행은 (지역, 사고유형, 연도)별 합계로 한 번만 줄여 두고, 새 연도가 들어오면
+# 그 연도 행만 다시 집계해 붙입니다. 추이와 이상치 점수는 작은 집계표에서 계산합니다.
+
+REGION_COLS = ["사고다발지역시도시군구", "시군구", "지역명", "사고지역위치명"]
+VALUE_COLS = ["사고건수", "사망자수", "사상자수"]
+ALL_TYPES = "전체"
+
+
+def find_region_col(df):
+    return next((c for c in REGION_COLS if c in df.columns), None)
+
+
+def aggregate_counts(df, year_col, type_col=None, region_col=None):
+    """(region, type, year)별 합계"""
+    region_col = region_col or find_region_col(df)
+    values = [c for c in VALUE_COLS if c in df.columns]
+    frame = pd.DataFrame({
+        "region": clean_regions(df[region_col]),
+        "type": df[type_col].astype(str) if type_col else ALL_TYPES,
+        "year": pd.to_numeric(df[year_col], errors="coerce"),
+    })
+    for c in values:
+        frame[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    if "사고건수" not in values:
+        frame["사고건수"] = 1
+        values = ["사고건수"] + values
+    frame = frame.dropna(subset=["year"])
+    frame["year"] = frame["year"].astype(int)
+    return frame.groupby(["region", "type", "year"], sort=False, observed=True)[values].sum().reset_index()
+
+
+def score_trends(counts, value="사고건수"):
+    """전년 대비 증감과 강건한 이상치 점수 (중앙값/MAD)"""
+    table = counts.sort_values(["region", "type", "year"]).reset_index(drop=True)
+    series = table.groupby(["region", "type"], sort=False, observed=True)
+    prev_year = series["year"].shift(1)
+    prev = series[value].shift(1)
+    # 첫 해는 비교 대상이 없고, 중간에 빈 해가 있으면 작년은 0건으로 봅니다
+    prev = prev.where(prev_year == table["year"] - 1, np.where(prev_year.isna(), np.nan, 0.0))
+    table["prev"] = prev
+    table["change"] = table[value] - prev
+    table["change_pct"] = np.where(prev > 0, table["change"] / prev.where(prev > 0, 1) * 100, np.nan)
+
+    # 같은 지역·유형의 과거 변화량 대비 얼마나 튀는지
+    grouped = table.groupby(["region", "type"], sort=False, observed=True)["change"]
+    median = grouped.transform("median")
+    mad = (table["change"] - median).abs().groupby([table["region"], table["type"]], sort=False).transform("median")
+    scale = 1.4826 * mad
+    scale = scale.where(scale > 0, np.maximum(median.abs(), 1.0))
+    table["anomaly"] = (table["change"] - median) / scale
+    return table
+
+
+def sum_over_types(counts):
+    """사고유형을 합친 지역별 합계 (type은 ALL_TYPES)"""
+    values = [c for c in counts.columns if c not in ("region", "type", "year")]
+    totals = counts.groupby(["region", "year"], sort=False, observed=True)[values].sum().reset_index()
+    totals.insert(1, "type", ALL_TYPES)
+    return totals
+
+
+def worst_rising(scored, year=None, top_n=20, min_count=1):
+    """해당 연도(기본: 최신)에 가장 나빠진 지역 순위"""
+    if scored.empty:
+        return scored
+    year = int(scored["year"].max()) if year is None else year
+    latest = scored[(scored["year"] == year) & (scored["change"] > 0) & (scored["사고건수"] >= min_count)]
+    ranked = latest.sort_values(["anomaly", "change"], ascending=False).head(top_n)
+    ranked = ranked.reset_index(drop=True)
+    ranked.insert(0, "순위", np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+class TrendStore:
+    """집계표를 들고 있다가 새 연도만 추가 집계"""
+
+    def __init__(self, year_col, type_col=None, region_col=None):
+        self.year_col = year_col
+        self.type_col = type_col
+        self.region_col = region_col
+        self.counts = None
+        self.scored = None
+        self.scored_total = None  # 유형을 합친 지역별 추이
+        self.version = None
+        self.lock = threading.Lock()
+
+    @property
+    def years(self):
+        return set() if self.counts is None else set(self.counts["year"].unique())
+
+    def update(self, df, refresh_years=(), version=None):
+        """df에서 아직 없는 연도(+ refresh_years)만 다시 집계해 반영"""
+        with self.lock:
+            if version is not None and version == self.version and self.scored is not None:
+                return self.scored
+            self.version = version
+            years = pd.to_numeric(df[self.year_col], errors="coerce")
+            todo = (set(years.dropna().astype(int).unique()) - self.years) | set(refresh_years)
+            if not todo and self.scored is not None:
+                return self.scored
+            fresh = aggregate_counts(df[years.isin(todo)], self.year_col, self.type_col, self.region_col)
+            if self.counts is not None:
+                fresh = pd.concat([self.counts[~self.counts["year"].isin(todo)], fresh], ignore_index=True)
+            self.counts = fresh
+            self.scored = score_trends(self.counts)
+            self.scored_total = score_trends(sum_over_types(self.counts))
+            return self.scored